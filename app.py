@@ -1,11 +1,24 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 import joblib
 import os
 import base64
+import json
+import sys
 from typing import Optional
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+from clean_data import load_cleaned_data, available_months
+from shared_dataset import load_shared_dataset
+from skill_index import skill_table_for, build_inverted_index, match_skills
+from aggregates import build_cube, query_cube, pairs_of_rows
+from compact_model import load_compact_model
+from skill_sketch import load_skill_sketches, merge_sketches
+from trends import load_trends, trending, bucket_counts, latest_salary_median
+
 # =============================================================================
 # 1. PAGE CONFIG
 # =============================================================================
@@ -388,16 +401,200 @@ div[data-testid="stAppViewContainer"] .main .stButton > button:active {
 # =============================================================================
 # 3. HELPERS
 # =============================================================================
+# Datasets (and their skill tables, indexes and cubes) kept per posting-month range
+PERIOD_CACHE_MAX_ENTRIES = 8
+
+
 @st.cache_data
-def load_data():
-    path = "data/vietnam_it_jobs_cleaned.csv"
-    return pd.read_csv(path) if os.path.exists(path) else None
+def load_months():
+    # 'YYYY-MM' months with postings, listed from the month partitions without reading rows
+    return available_months("data/vietnam_it_jobs_cleaned.csv")
+
+
+def period_bounds(period):
+    """[since, until) Posted Date bounds of a (first month, last month) range; (None, None) for all."""
+    if period is None:
+        return None, None
+    return pd.Period(period[0], "M").start_time, (pd.Period(period[1], "M") + 1).start_time
+
+
+@st.cache_resource
+def load_shared_data():
+    # Memory-mapped columns published by clean_data: one read-only copy of the pages
+    # for every session and every app process on the machine
+    return load_shared_dataset("data/vietnam_it_jobs_cleaned.csv")
+
+
+@st.cache_resource(max_entries=PERIOD_CACHE_MAX_ENTRIES)
+def load_data(period=None):
+    # Shared by all sessions without copying (treat as read-only). The memory-mapped
+    # columns when published, else the Parquet copy pruned to the month partitions
+    # inside `period` (or the CSV)
+    since, until = period_bounds(period)
+    shared = load_shared_data()
+    if shared is None:
+        return load_cleaned_data("data/vietnam_it_jobs_cleaned.csv", since=since, until=until)
+    if period is None:
+        return shared
+    posted = shared["Posted Date"]
+    return shared[((posted >= since) & (posted < until)).to_numpy()].reset_index(drop=True)
+
+
+@st.cache_resource(max_entries=PERIOD_CACHE_MAX_ENTRIES)
+def load_skills(period=None):
+    # (rows, skill_ids, vocab): integer job-to-skill table aligned to load_data(period)
+    data = load_data(period)
+    return skill_table_for(data) if data is not None else None
+
+
+@st.cache_resource(max_entries=PERIOD_CACHE_MAX_ENTRIES)
+def load_skill_index(period=None):
+    # Inverted index skill_id -> row positions, built once per process and period
+    table = load_skills(period)
+    if table is None:
+        return None
+    rows, ids, vocab = table
+    return build_inverted_index(rows, ids, len(vocab))
+
+
+@st.cache_resource(max_entries=PERIOD_CACHE_MAX_ENTRIES)
+def load_cube(period=None):
+    # Location x Experience x Job Title x (skill) x salary-bucket aggregates
+    data, table = load_data(period), load_skills(period)
+    if data is None:
+        return None
+    rows, ids, vocab = table
+    return build_cube(data, rows, ids, len(vocab))
+
+
+@st.cache_resource(max_entries=PERIOD_CACHE_MAX_ENTRIES)
+def load_skill_sketch(period=None):
+    # Top-K skill sketch merged from the per-month sketches of `period` (all months by default)
+    sketches = load_skill_sketches("data/vietnam_it_jobs_cleaned.csv")
+    if not sketches:
+        return None
+    months = None if period is None else {m for m in sketches if period[0] <= m <= period[1]}
+    return merge_sketches(sketches, months)
+
+
+@st.cache_resource
+def load_trend_data():
+    # Daily posting counts per skill/title/location + salary histograms, precomputed by clean_data
+    return load_trends("data/vietnam_it_jobs_cleaned.csv")
+
+
+TREND_WINDOW_DAYS = 30
+
+
+# Filter results are shared by every session: bounded LRU + TTL eviction
+FILTER_CACHE_MAX_ENTRIES = 256
+FILTER_CACHE_TTL_SECONDS = 600
+
+
+def filter_key(location, salary_range, selected_skills, match_mode, period=None):
+    """Canonical, hashable filter state (skill order does not matter)."""
+    skills_key = tuple(sorted(selected_skills))
+    return (
+        location,
+        (int(salary_range[0]), int(salary_range[1])),
+        skills_key,
+        match_mode if skills_key else "any",
+        period,
+    )
+
+
+def filter_rows(key):
+    """Sorted row positions of `load_data(period)` matching a `filter_key(...)`.
+
+    Not cached: a cached copy (N int64s) would be deserialized on every
+    rerun, and only skill filters and the data table need the rows.
+    """
+    location, salary_range, selected_skills, match_mode, period = key
+    data = load_data(period)
+    salary = data["Avg_Salary_Million"].to_numpy()
+    mask = (salary >= salary_range[0]) & (salary <= salary_range[1])
+    if location is not None:
+        mask &= (data["Location"] == location).to_numpy()
+    if selected_skills:
+        # Exact skill matching (ANY / ALL) through the inverted index
+        skill_id_of = {name: i for i, name in enumerate(load_skills(period)[2])}
+        mask &= match_skills(load_skill_index(period), [skill_id_of[s] for s in selected_skills], len(data),
+                             mode=match_mode)
+    return np.flatnonzero(mask)
+
+
+@st.cache_data(max_entries=FILTER_CACHE_MAX_ENTRIES, ttl=FILTER_CACHE_TTL_SECONDS, show_spinner=False)
+def filter_and_aggregate(key):
+    """Dashboard aggregates for a `filter_key(...)`."""
+    location, salary_range, selected_skills, match_mode, period = key
+    if not selected_skills:
+        # KPIs and charts come from summing pre-aggregated cube cells
+        return query_cube(load_cube(period), location=location, salary_range=salary_range)
+
+    data = load_data(period)
+    rows, ids, vocab = load_skills(period)
+    matching = filter_rows(key)
+    if len(selected_skills) == 1:
+        # One skill: its postings are exactly that skill's cube cells; only the
+        # other skills of the matching rows are counted from the skill table
+        summary = query_cube(load_cube(period), location=location, salary_range=salary_range,
+                             skill=vocab.index(selected_skills[0]))
+        summary["skill_counts"] = np.bincount(ids[pairs_of_rows(rows, matching)], minlength=len(vocab))
+        return summary
+    # Several skills cut across cube cells: aggregate just the matching rows
+    return query_cube(build_cube(data, rows, ids, len(vocab), rows=matching))
+
+
+MODEL_PATH = "models/salary_model.pkl"
+PREDICTION_TABLE_PATH = "models/salary_prediction_table.csv"
+MODEL_METADATA_PATH = "models/salary_model.json"
+BACKEND_LABELS = {"random_forest": "Random Forest", "hist_gradient_boosting": "Histogram Gradient Boosting"}
 
 
 @st.cache_resource
 def load_model():
-    path = "models/salary_model.pkl"
-    return joblib.load(path) if os.path.exists(path) else None
+    # Memory-mapped NumPy forest when exported, else the pickled sklearn pipeline (any backend)
+    compact = load_compact_model(MODEL_PATH)
+    if compact is not None:
+        return compact
+    return joblib.load(MODEL_PATH) if os.path.exists(MODEL_PATH) else None
+
+
+@st.cache_data
+def load_model_metadata():
+    # Backend and test metrics written next to the model by train_model.py
+    if not os.path.exists(MODEL_METADATA_PATH):
+        return None
+    with open(MODEL_METADATA_PATH) as f:
+        return json.load(f)
+
+
+@st.cache_resource
+def load_prediction_table():
+    # (Experience, Job Title, Location) -> prediction, P10/P50/P90 and market stats, precomputed at train time
+    if not os.path.exists(PREDICTION_TABLE_PATH):
+        return None
+    table = pd.read_csv(PREDICTION_TABLE_PATH)
+    keys = zip(table["Experience"], table["Job Title"], table["Location"])
+    return dict(zip(keys, table.to_dict("records")))
+
+
+def salary_estimate(exp, loc, title):
+    """Precomputed table row for a combination (None if it was not in the training data)."""
+    table = load_prediction_table()
+    return table.get((exp, title, loc)) if table is not None else None
+
+
+def predict_salary(exp, loc, title):
+    """O(1) table lookup; the model is only loaded for unseen combinations."""
+    row = salary_estimate(exp, loc, title)
+    if row is not None:
+        return row["Predicted_Salary_Million"]
+    return load_model().predict(pd.DataFrame([{
+        "Experience": exp,
+        "Location": loc,
+        "Job Title": title
+    }]))[0]
 
 
 @st.cache_data
@@ -438,8 +635,7 @@ def gg_plotly_layout(fig, title_x: Optional[str] = None, title_y: Optional[str]
     return fig
 
 
-df = load_data()
-model = load_model()
+model_available = load_prediction_table() is not None or os.path.exists(MODEL_PATH)
 
 # =============================================================================
 # 4. SIDEBAR
@@ -466,14 +662,29 @@ with st.sidebar:
 
     # --- Advanced Filters ---
     st.markdown("### 🎯 Bộ lọc nâng cao")
-    
-    # 1. Location Filter
+
+    # 1. Posting Month Filter (only the matching month partitions are read)
+    months = load_months()
+    period = None
+    if len(months) > 1:
+        first_month, last_month = st.select_slider(
+            "Tháng đăng tin",
+            options=months,
+            value=(months[0], months[-1]),
+            format_func=lambda m: f"{m[5:]}/{m[:4]}",
+        )
+        if (first_month, last_month) != (months[0], months[-1]):
+            period = (first_month, last_month)
+    df = load_data(period)
+    skills = load_skills(period)
+
+    # 2. Location Filter
     selected_loc = st.selectbox(
         "Địa điểm",
         ["Tất cả địa điểm"] + sorted(df["Location"].unique())
     )
 
-    # 2. Salary Range Filter
+    # 3. Salary Range Filter
     min_sal = int(df["Avg_Salary_Million"].min())
     max_sal = int(df["Avg_Salary_Million"].max())
     salary_range = st.slider(
@@ -483,32 +694,30 @@ with st.sidebar:
         value=(min_sal, max_sal)
     )
 
-    # 3. Skills Filter
-    all_skills = sorted(list(set(df["Skills"].str.split(",").explode().str.strip().unique())))
+    # 4. Skills Filter
+    skill_vocab = skills[2]
+    all_skills = sorted(skill_vocab)
     selected_skills = st.multiselect("Kỹ năng", all_skills)
+    skill_match = st.radio(
+        "Khớp kỹ năng",
+        ["Bất kỳ kỹ năng nào", "Tất cả kỹ năng"],
+        horizontal=True,
+        disabled=not selected_skills
+    )
 
 # =============================================================================
 # 5. MAIN
 # =============================================================================
-df_view = df
 if page == "📊 Phân tích thị trường" and df is not None:
-    # Filter by Location
-    if selected_loc != "Tất cả địa điểm":
-        df_view = df_view[df_view["Location"] == selected_loc]
-    
-    # Filter by Salary
-    df_view = df_view[
-        (df_view["Avg_Salary_Million"] >= salary_range[0]) & 
-        (df_view["Avg_Salary_Million"] <= salary_range[1])
-    ]
-
-    # Filter by Skills
-    if selected_skills:
-        # Filter rows that contain ANY of the selected skills
-        # Case-insensitive matching
-        pattern = "|".join([os.path.normcase(s) for s in selected_skills]) 
-        # Actually dataset skills are already lower/cleaned but let's be safe
-        df_view = df_view[df_view["Skills"].apply(lambda x: any(s in x for s in selected_skills))]
+    # Aggregates memoized per canonical filter state; rows are only looked up for the data table
+    view_key = filter_key(
+        None if selected_loc == "Tất cả địa điểm" else selected_loc,
+        salary_range,
+        selected_skills,
+        "all" if skill_match == "Tất cả kỹ năng" else "any",
+        period,
+    )
+    summary = filter_and_aggregate(view_key)
 
 
 logo = logo_uri()
@@ -530,12 +739,20 @@ if page == "📊 Phân tích thị trường":
         unsafe_allow_html=True,
     )
 
-    if df_view is not None:
-        total_jobs = len(df_view)
-        avg_salary = df_view["Avg_Salary_Million"].mean()
-        top_location = df_view["Location"].mode()[0]
-        skills_series = df_view["Skills"].str.split(",").explode().str.strip()
-        top_skill = skills_series.mode()[0].title() if not skills_series.empty else "N/A"
+    if df is not None:
+        total_jobs = summary["total_jobs"]
+        avg_salary = summary["avg_salary"]
+        top_location = summary["top_location"]
+        skill_counts = summary["skill_counts"]
+        unfiltered = selected_loc == "Tất cả địa điểm" and salary_range == (min_sal, max_sal) and not selected_skills
+        sketch = load_skill_sketch(period) if unfiltered else None
+        if sketch is not None:
+            # Unfiltered view: top skills straight from the sketches of the selected months
+            top_skill_counts = sketch.top(10)
+        else:
+            top_ids = np.argsort(-skill_counts, kind="stable")[:10]
+            top_skill_counts = [(skill_vocab[i], skill_counts[i]) for i in top_ids if skill_counts[i] > 0]
+        top_skill = top_skill_counts[0][0].title() if top_skill_counts else "N/A"
 
         st.markdown("<div class='gg-kpi-row'>", unsafe_allow_html=True)
         c1, c2, c3, c4 = st.columns(4)
@@ -600,10 +817,8 @@ if page == "📊 Phân tích thị trường":
 
         with col_skill:
             st.markdown('<div class="gg-section-title">🚀 Top Kỹ năng được yêu cầu</div>', unsafe_allow_html=True)
-            if not skills_series.empty:
-                # Calculate top skills
-                top_skills = skills_series.value_counts().head(10).reset_index()
-                top_skills.columns = ["Skill", "Count"]
+            if top_skill_counts:
+                top_skills = pd.DataFrame(top_skill_counts, columns=["Skill", "Count"])
 
                 fig = px.bar(
                     top_skills, 
@@ -624,9 +839,8 @@ if page == "📊 Phân tích thị trường":
 
         with col_loc:
             st.markdown('<div class="gg-section-title">📍 Mức lương theo Địa điểm</div>', unsafe_allow_html=True)
-            # Calculate salary by location
-            salary_by_loc = df_view.groupby("Location")["Avg_Salary_Million"].mean().sort_values(ascending=False).reset_index()
-            
+            salary_by_loc = summary["salary_by_location"]
+
             fig = px.bar(
                 salary_by_loc,
                 x="Location",
@@ -644,37 +858,88 @@ if page == "📊 Phân tích thị trường":
         col1, col2 = st.columns(2)
         with col1:
             st.markdown('<div class="gg-section-title">💰 Phân phối mức lương</div>', unsafe_allow_html=True)
-            fig = px.histogram(
-                df_view, 
-                x="Avg_Salary_Million", 
-                nbins=20,
+            # Pre-binned counts from the cube
+            fig = px.bar(
+                summary["salary_hist"],
+                x="Salary",
+                y="Count",
                 color_discrete_sequence=["#3b82f6"]
             )
-            fig.update_traces(marker_line_color="white", marker_line_width=1, opacity=0.9)
+            fig.update_traces(width=summary["salary_hist_width"], marker_line_color="white", marker_line_width=1, opacity=0.9)
             gg_plotly_layout(fig, title_x="Mức lương (Triệu VNĐ)", title_y="Số lượng tin")
             st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
 
         with col2:
             st.markdown('<div class="gg-section-title">🏆 Lương theo kinh nghiệm</div>', unsafe_allow_html=True)
-            fig = px.box(
-                df_view, 
-                x="Experience", 
-                y="Avg_Salary_Million",
-                color="Experience",
-                color_discrete_sequence=px.colors.qualitative.Safe,
-                category_orders={"Experience": ["Fresher", "Junior", "Senior", "Lead", "Manager"]}
-            )
+            # Box stats precomputed from the cube buckets (no per-row data sent to the chart)
+            fig = go.Figure()
+            box_stats = summary["salary_by_experience"]
+            levels = [level for level in ["Fresher", "Junior", "Senior", "Lead", "Manager"] if level in box_stats]
+            for level, color in zip(levels, px.colors.qualitative.Safe):
+                stats = box_stats[level]
+                fig.add_trace(go.Box(
+                    x=[level], q1=[stats["q1"]], median=[stats["med"]], q3=[stats["q3"]],
+                    lowerfence=[stats["whislo"]], upperfence=[stats["whishi"]],
+                    name=level, marker_color=color
+                ))
+                if len(stats["fliers"]):
+                    fig.add_trace(go.Scatter(
+                        x=[level] * len(stats["fliers"]), y=stats["fliers"], mode="markers",
+                        marker_color=color, showlegend=False, hoverinfo="y"
+                    ))
             gg_plotly_layout(fig, title_x=None, title_y="Mức lương (Triệu VNĐ)")
             st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
 
-        # --- ROW 3: Raw Data View ---
+        # --- ROW 3: Trending skills (whole market, from the precomputed daily series) ---
+        trends = load_trend_data()
+        if trends is not None:
+            st.markdown("")
+            col_trend, col_series = st.columns([1, 1.5])
+            rising = trending(trends, "skill", window_days=TREND_WINDOW_DAYS, top=8, min_count=3)
+            with col_trend:
+                st.markdown(
+                    f'<div class="gg-section-title">🔥 Kỹ năng đang lên ({TREND_WINDOW_DAYS} ngày gần nhất)</div>',
+                    unsafe_allow_html=True,
+                )
+                if len(rising):
+                    compare = rising.melt(id_vars="Name", value_vars=["Previous", "Current"],
+                                          var_name="Window", value_name="Count")
+                    compare["Window"] = compare["Window"].map({
+                        "Previous": f"{TREND_WINDOW_DAYS} ngày trước đó",
+                        "Current": f"{TREND_WINDOW_DAYS} ngày gần nhất",
+                    })
+                    fig = px.bar(
+                        compare, x="Count", y="Name", color="Window", barmode="group", orientation="h",
+                        color_discrete_sequence=["#93c5fd", "#1d4ed8"]
+                    )
+                    fig.update_layout(yaxis=dict(autorange="reversed"), legend_title_text=None)
+                    gg_plotly_layout(fig, title_x="Số lượng tin tuyển dụng", title_y=None)
+                    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+                else:
+                    st.info("Chưa đủ dữ liệu để xác định xu hướng.")
+
+            with col_series:
+                st.markdown('<div class="gg-section-title">📈 Tin tuyển dụng theo tuần</div>', unsafe_allow_html=True)
+                weekly = bucket_counts(trends, "skill", "week")
+                shown = list(rising["Name"].head(5)) or list(weekly.sum().nlargest(5).index)
+                series = weekly[shown].tail(26).rename_axis("Week").reset_index().melt(
+                    id_vars="Week", var_name="Skill", value_name="Count")
+                fig = px.line(series, x="Week", y="Count", color="Skill", markers=True)
+                gg_plotly_layout(fig, title_x=None, title_y="Số lượng tin")
+                st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+                median = latest_salary_median(trends, TREND_WINDOW_DAYS)
+                st.caption(f"Lương trung vị {TREND_WINDOW_DAYS} ngày gần nhất: {median:.1f} triệu VNĐ · Toàn thị trường")
+
+        # --- ROW 4: Raw Data View ---
         st.markdown("")
         with st.expander("🔍 Xem dữ liệu chi tiết", expanded=False):
-            st.dataframe(
-                df_view[["Job Title", "Company", "Location", "Salary", "Skills", "Experience", "Posted Date"]],
-                use_container_width=True,
-                hide_index=True
-            )
+            # The expander body always runs, so the rows are only looked up once asked for
+            if st.toggle("Hiển thị các tin đăng khớp bộ lọc"):
+                st.dataframe(
+                    df.iloc[filter_rows(view_key)][["Job Title", "Company", "Location", "Salary", "Skills", "Experience", "Posted Date"]],
+                    use_container_width=True,
+                    hide_index=True
+                )
 
 elif page == "🔮 Dự đoán mức lương":
     st.markdown(
@@ -690,7 +955,7 @@ elif page == "🔮 Dự đoán mức lương":
         unsafe_allow_html=True,
     )
 
-    if model and df is not None:
+    if model_available and df is not None:
         l, c, r = st.columns([1, 1.25, 1])
         with c:
            
@@ -701,14 +966,26 @@ elif page == "🔮 Dự đoán mức lương":
             title = st.selectbox("Vị trí", sorted(df["Job Title"].unique()))
 
             if st.button("🚀 Dự đoán mức lương"):
-                pred = model.predict(pd.DataFrame([{
-                    "Experience": exp,
-                    "Location": loc,
-                    "Job Title": title
-                }]))[0]
+                pred = predict_salary(exp, loc, title)
 
                 st.markdown("<div style='margin-top:14px'></div>", unsafe_allow_html=True)
                 st.success(f"Mức lương ước tính: {pred:.1f} triệu VNĐ")
+                row = salary_estimate(exp, loc, title)
+                if row is not None and pd.notna(row.get("Salary_P10")):
+                    st.markdown(
+                        f"📉 Khoảng dự đoán (P10–P90): **{row['Salary_P10']:.1f} – {row['Salary_P90']:.1f}** triệu VNĐ "
+                        f"(trung vị {row['Salary_P50']:.1f})"
+                    )
+                if row is not None and row.get("Market_Count", 0) > 0:
+                    st.markdown(
+                        f"🏷️ Thị trường ({int(row['Market_Count'])} tin): Min **{row['Market_Min']:.1f}** · "
+                        f"TB **{row['Market_Avg']:.1f}** · Max **{row['Market_Max']:.1f}** triệu VNĐ"
+                    )
+                metadata = load_model_metadata()
+                if metadata is not None:
+                    backend = BACKEND_LABELS.get(metadata.get("backend"), metadata.get("backend"))
+                    mae = metadata.get("metrics", {}).get("test_mae")
+                    st.caption(f"Mô hình: {backend}" + (f" · MAE {mae:.2f} triệu VNĐ" if mae is not None else ""))
 
             st.markdown("</div>", unsafe_allow_html=True)
 
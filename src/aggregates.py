@@ -0,0 +1,250 @@
+import pandas as pd
+import numpy as np
+
+# Dimensions of the pre-aggregated cube (plus the salary bucket)
+CUBE_DIMS = ['Location', 'Experience', 'Job Title']
+HIST_BINS = 20
+# Width of the fixed salary bins used by the mergeable EDA histograms (Million VND)
+SALARY_BIN = 0.25
+# Salaries at or above this go to one overflow bin, so histograms have a fixed size
+SALARY_MAX = 250
+N_SALARY_BINS = int(SALARY_MAX / SALARY_BIN) + 1
+
+
+def salary_bucket(salary):
+    """Half-open bucket code per salary: 2*floor(s) + (s has a fraction).
+
+    For integer bounds this is exact: s >= lo <=> code >= 2*lo and
+    s <= hi <=> code <= 2*hi, so slider filters never split a bucket.
+    """
+    salary = np.asarray(salary, dtype=np.float64)
+    floor = np.floor(salary)
+    return (2 * floor + (salary > floor)).astype(np.int64)
+
+
+def _dim_codes(column, rows=None):
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes = column.cat.codes.to_numpy()
+        return (codes if rows is None else codes[rows]).astype(np.int64), list(column.cat.categories)
+    codes, uniques = pd.factorize(column, sort=True)
+    return (codes if rows is None else codes[rows]).astype(np.int64), list(uniques)
+
+
+def pairs_of_rows(skill_rows, rows):
+    """Indices of the skill-table pairs whose row is in `rows`.
+
+    Both must be sorted (as `skill_table_for` returns them): each row's
+    pairs are found by binary search, so the cost depends on `rows`, not
+    on the size of the table.
+    """
+    starts = np.searchsorted(skill_rows, rows, side='left')
+    lengths = np.searchsorted(skill_rows, rows, side='right') - starts
+    return np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+
+
+def build_cube(df, skill_rows, skill_ids, n_skills, rows=None):
+    """Aggregate postings by Location x Experience x Job Title x salary bucket.
+
+    Returns a dict with a job cube (Count, Salary_Sum per cell), a skill
+    cube (Count, Salary_Sum per cell and skill id) and the category names
+    of every dimension. `rows` (sorted positions) restricts the cube to
+    those rows of `df`; only they and their skill pairs are read.
+    """
+    categories = {}
+    jobs = {}
+    for dim in CUBE_DIMS:
+        jobs[dim], categories[dim] = _dim_codes(df[dim], rows)
+    salary = df['Avg_Salary_Million'].to_numpy()
+    salary = (salary if rows is None else salary[rows]).astype(np.float64)
+    jobs['Bucket'] = salary_bucket(salary)
+    jobs['Salary'] = salary
+    jobs = pd.DataFrame(jobs)
+
+    if rows is not None:
+        pairs = pairs_of_rows(skill_rows, rows)
+        skill_rows, skill_ids = np.searchsorted(rows, skill_rows[pairs]), skill_ids[pairs]
+    skills = jobs.iloc[skill_rows].reset_index(drop=True)
+    skills['Skill'] = skill_ids
+
+    keys = CUBE_DIMS + ['Bucket']
+    job_cube = jobs.groupby(keys).agg(Count=('Salary', 'size'), Salary_Sum=('Salary', 'sum')).reset_index()
+    skill_cube = skills.groupby(keys + ['Skill']).agg(Count=('Salary', 'size'),
+                                                      Salary_Sum=('Salary', 'sum')).reset_index()
+
+    return {'jobs': job_cube, 'skills': skill_cube, 'categories': categories, 'n_skills': n_skills}
+
+
+def _cell_mask(cells, categories, location, experience, job_title, salary_range):
+    mask = np.ones(len(cells), dtype=bool)
+    for dim, value in (('Location', location), ('Experience', experience), ('Job Title', job_title)):
+        if value is not None:
+            code = categories[dim].index(value) if value in categories[dim] else -1
+            mask &= cells[dim].to_numpy() == code
+    if salary_range is not None:
+        bucket = cells['Bucket'].to_numpy()
+        mask &= (bucket >= 2 * salary_range[0]) & (bucket <= 2 * salary_range[1])
+    return mask
+
+
+def query_cube(cube, location=None, experience=None, job_title=None, salary_range=None, skill=None):
+    """Dashboard KPIs and chart data answered by summing cube cells.
+
+    `salary_range` is an inclusive pair of integer bounds (Million VND).
+    'salary_by_experience' holds `box_stats` per Experience level. With a
+    `skill` id, only postings having that skill are counted (its
+    skill cube cells); 'skill_counts' is then None, as the cells do not
+    record which other skills those postings have.
+    """
+    categories = cube['categories']
+    skills = cube['skills']
+    skills = skills[_cell_mask(skills, categories, location, experience, job_title, salary_range)]
+    if skill is None:
+        jobs = cube['jobs']
+        jobs = jobs[_cell_mask(jobs, categories, location, experience, job_title, salary_range)]
+        skill_counts = np.bincount(skills['Skill'].to_numpy(), weights=skills['Count'].to_numpy(),
+                                   minlength=cube['n_skills']).astype(np.int64)
+    else:
+        jobs = skills[skills['Skill'].to_numpy() == skill]
+        skill_counts = None
+
+    count = jobs['Count'].to_numpy()
+    total_jobs = int(count.sum())
+    result = {
+        'total_jobs': total_jobs,
+        'avg_salary': jobs['Salary_Sum'].sum() / total_jobs if total_jobs else float('nan'),
+        'skill_counts': skill_counts
+    }
+
+    # Location KPI and salary by location
+    locations = categories['Location']
+    loc_codes = jobs['Location'].to_numpy()
+    loc_count = np.bincount(loc_codes, weights=count, minlength=len(locations))
+    loc_sum = np.bincount(loc_codes, weights=jobs['Salary_Sum'].to_numpy(), minlength=len(locations))
+    result['top_location'] = locations[int(loc_count.argmax())] if total_jobs else "N/A"
+    present = loc_count > 0
+    result['salary_by_location'] = pd.DataFrame({
+        'Location': np.array(locations, dtype=object)[present],
+        'Avg_Salary_Million': loc_sum[present] / loc_count[present]
+    }).sort_values('Avg_Salary_Million', ascending=False, ignore_index=True)
+
+    # Salary histogram on integer-aligned bins (each bucket falls in one bin)
+    if total_jobs:
+        floor = jobs['Bucket'].to_numpy() // 2
+        lo, hi = int(floor.min()), int(floor.max())
+        width = max(1, -(-(hi + 1 - lo) // HIST_BINS))
+        hist = np.bincount((floor - lo) // width, weights=count)
+        starts = lo + width * np.arange(len(hist))
+    else:
+        width, hist, starts = 1, np.array([]), np.array([])
+    result['salary_hist'] = pd.DataFrame({'Salary': starts + width / 2, 'Count': hist.astype(np.int64)})
+    result['salary_hist_width'] = width
+
+    # Box stats per Experience from the buckets: a bucket stands for floor(s) or floor(s) + 0.5,
+    # exact for the integer and .5 averages of salary ranges
+    experiences = categories['Experience']
+    bins = np.floor(np.minimum(jobs['Bucket'].to_numpy() / 2, SALARY_MAX) / SALARY_BIN).astype(np.int64)
+    hists = np.bincount(jobs['Experience'].to_numpy() * N_SALARY_BINS + bins, weights=count,
+                        minlength=len(experiences) * N_SALARY_BINS).reshape(len(experiences), N_SALARY_BINS)
+    result['salary_by_experience'] = {label: box_stats(h.astype(np.int64), label)
+                                      for label, h in zip(experiences, hists) if h.sum()}
+
+    return result
+
+
+def salary_histogram(salary, groups=None, n_groups=1):
+    """Counts per group on fixed `SALARY_BIN`-wide bins starting at 0, shape (n_groups, N_SALARY_BINS).
+
+    Bin edges never depend on the data, so histograms of different chunks
+    or partitions merge exactly with `merge_histograms`, and the size
+    does not depend on the largest salary: everything from `SALARY_MAX`
+    up lands in the last (overflow) bin. Missing salaries and rows with
+    a negative group code are skipped.
+    """
+    salary = np.asarray(salary, dtype=np.float64)
+    groups = np.zeros(len(salary), dtype=np.int64) if groups is None else np.asarray(groups, dtype=np.int64)
+    valid = ~np.isnan(salary) & (salary >= 0) & (groups >= 0)
+    bins = np.floor(np.minimum(salary[valid], SALARY_MAX) / SALARY_BIN).astype(np.int64)
+    counts = np.bincount(groups[valid] * N_SALARY_BINS + bins, minlength=n_groups * N_SALARY_BINS)
+    return counts.reshape(n_groups, N_SALARY_BINS)
+
+
+def merge_histograms(*hists):
+    """Sum `salary_histogram` outputs (narrower, older histograms are zero-padded)."""
+    n_bins = max(h.shape[1] for h in hists)
+    out = np.zeros((hists[0].shape[0], n_bins), dtype=np.int64)
+    for h in hists:
+        out[:, :h.shape[1]] += h
+    return out
+
+
+def merge_keyed(keys_a, a, keys_b, b):
+    """Sum two arrays whose first axis is labelled by `keys_*` (other axes are zero-padded).
+
+    Returns `(keys, summed)`; keys of `a` keep their order, new keys of `b` follow.
+    """
+    seen = set(keys_a)
+    keys = list(keys_a) + [k for k in keys_b if k not in seen]
+    index = {k: i for i, k in enumerate(keys)}
+    out = np.zeros((len(keys),) + tuple(map(max, a.shape[1:], b.shape[1:])), dtype=np.int64)
+    for keys_x, x in ((keys_a, a), (keys_b, b)):
+        out[(np.array([index[k] for k in keys_x], dtype=np.int64),) + tuple(slice(0, n) for n in x.shape[1:])] += x
+    return keys, out
+
+
+def _bin_values(n_bins):
+    # Salaries are represented by their bin's lower edge (exact for multiples of SALARY_BIN);
+    # the overflow bin's edge is SALARY_MAX, i.e. larger salaries count as SALARY_MAX
+    return np.arange(n_bins) * SALARY_BIN
+
+
+def histogram_quantiles(counts, q):
+    """Quantiles of a 1-D binned salary histogram, interpolated like `np.percentile`.
+
+    Exact to within one bin below `SALARY_MAX`; a quantile that falls in
+    the overflow bin is reported as `SALARY_MAX` (a lower bound).
+    """
+    q = np.asarray(q, dtype=np.float64)
+    n = counts.sum()
+    if n == 0:
+        return np.full(q.shape, np.nan)
+    cum = np.cumsum(counts)
+    rank = q * (n - 1)
+    lo = _bin_values(len(counts))[np.searchsorted(cum, np.floor(rank), side='right')]
+    hi = _bin_values(len(counts))[np.searchsorted(cum, np.ceil(rank), side='right')]
+    return lo + (hi - lo) * (rank - np.floor(rank))
+
+
+def box_stats(counts, label=None, whis=1.5):
+    """Tukey box plot statistics (the `Axes.bxp` format) from a binned histogram.
+
+    Fliers are the distinct outlying values, which draw the same as one
+    marker per row; salaries above `SALARY_MAX` show as one flier at
+    `SALARY_MAX`.
+    """
+    q1, med, q3 = histogram_quantiles(counts, [0.25, 0.5, 0.75])
+    values = _bin_values(len(counts))[counts > 0]
+    iqr = q3 - q1
+    inside = values[(values >= q1 - whis * iqr) & (values <= q3 + whis * iqr)]
+    return {
+        'label': label, 'med': med, 'q1': q1, 'q3': q3,
+        'whislo': inside.min() if len(inside) else q1,
+        'whishi': inside.max() if len(inside) else q3,
+        'fliers': values[(values < q1 - whis * iqr) | (values > q3 + whis * iqr)],
+    }
+
+
+def histogram_kde(counts, grid):
+    """Gaussian KDE (Scott's bandwidth) of a binned histogram, evaluated on `grid`.
+
+    Cost is O(len(grid) x non-empty bins), independent of the row count.
+    """
+    n = counts.sum()
+    if n < 2:
+        return np.zeros(len(grid))
+    nonzero = np.flatnonzero(counts)
+    values, weights = _bin_values(len(counts))[nonzero], counts[nonzero].astype(np.float64)
+    mean = np.dot(values, weights) / n
+    std = np.sqrt(np.dot((values - mean) ** 2, weights) / (n - 1))
+    bw = max(std, SALARY_BIN) * n ** (-1 / 5)
+    z = (np.asarray(grid)[:, None] - values[None, :]) / bw
+    return np.exp(-0.5 * z ** 2) @ weights / (n * bw * np.sqrt(2 * np.pi))
@@ -0,0 +1,135 @@
+import pandas as pd
+import numpy as np
+import joblib
+import argparse
+import os
+import time
+
+FEATURES = ['Experience', 'Job Title', 'Location']
+PREDICTION_COLUMN = 'Predicted_Salary_Million'
+
+
+def _file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.csv', '.parquet'):
+        return ext[1:]
+    raise ValueError(f"Unsupported file format '{ext}' (expected .csv or .parquet)")
+
+
+def _read_chunks(input_path, chunk_size):
+    if _file_format(input_path) == 'csv':
+        # Columns stay text, so every chunk has the same types whatever values it happens to hold
+        yield from pd.read_csv(input_path, chunksize=chunk_size, dtype=str)
+    else:
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas(ignore_metadata=True)
+
+
+def _output_schema(input_path):
+    """Arrow schema of the output: the input's columns plus the float64 prediction."""
+    import pyarrow as pa
+    if _file_format(input_path) == 'csv':
+        schema = pa.schema([(col, pa.string()) for col in pd.read_csv(input_path, nrows=0).columns])
+    else:
+        import pyarrow.parquet as pq
+        schema = pq.ParquetFile(input_path).schema_arrow.remove_metadata()
+    if PREDICTION_COLUMN in schema.names:
+        schema = schema.remove(schema.get_field_index(PREDICTION_COLUMN))
+    return schema.append(pa.field(PREDICTION_COLUMN, pa.float64()))
+
+
+def known_categories(model):
+    """{feature: categories seen at fit time}, read from the pipeline's fitted encoders."""
+    known = {}
+    for _, encoder, columns in model.named_steps['preprocessor'].transformers_:
+        if hasattr(encoder, 'categories_'):
+            known.update(zip(columns, encoder.categories_))
+    return known
+
+
+def predict_chunk(model, chunk, known=None):
+    """Predicted salary per row; NaN where a feature is missing or unknown.
+
+    A value is unknown when the model's encoders did not see it during
+    training (`known`, defaults to `known_categories(model)`).
+    """
+    missing = [col for col in FEATURES if col not in chunk.columns]
+    if missing:
+        raise ValueError(f"Input is missing feature columns: {missing}")
+    if known is None:
+        known = known_categories(model)
+    X = chunk[FEATURES].astype(object)
+    valid = X.notna().all(axis=1)
+    for col in FEATURES:
+        valid &= X[col].isin(known[col])
+    valid = valid.to_numpy()
+    pred = np.full(len(chunk), np.nan)
+    if valid.any():
+        pred[valid] = model.predict(X[valid])
+    return pred
+
+
+def predict_file(input_path, output_path, model_path="models/salary_model.pkl",
+                 chunk_size=100_000, n_jobs=None):
+    """Stream a CSV/Parquet job feed through the saved pipeline in chunks.
+
+    Writes the input columns plus `Predicted_Salary_Million` to
+    `output_path` (.csv or .parquet) and returns the number of rows scored.
+    The Parquet schema is fixed up front from the input (CSV columns are
+    passed through as text), not inferred from the first chunk.
+    """
+    out_format = _file_format(output_path)
+    print(f"Loading model from {model_path}...")
+    model = joblib.load(model_path)
+    if n_jobs is not None:
+        if 'regressor__n_jobs' in model.get_params():
+            model.set_params(regressor__n_jobs=n_jobs)
+        else:
+            print(f"Warning: {type(model.named_steps['regressor']).__name__} has no n_jobs, ignoring --n-jobs "
+                  "(gradient boosting uses all cores through OpenMP; set OMP_NUM_THREADS to limit it)")
+    known = known_categories(model)
+
+    out_dir = os.path.dirname(output_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    rows = 0
+    writer = None
+    start = time.perf_counter()
+    try:
+        for i, chunk in enumerate(_read_chunks(input_path, chunk_size)):
+            chunk[PREDICTION_COLUMN] = predict_chunk(model, chunk, known)
+            if out_format == 'csv':
+                chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                if writer is None:
+                    schema = _output_schema(input_path)
+                    writer = pq.ParquetWriter(output_path, schema)
+                writer.write_table(pa.Table.from_pandas(chunk[schema.names], schema=schema, preserve_index=False))
+            rows += len(chunk)
+            elapsed = time.perf_counter() - start
+            print(f"  chunk {i + 1}: {rows:,} rows scored ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    finally:
+        if writer is not None:
+            writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Scored {rows:,} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    print(f"Predictions saved to {output_path}")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch salary prediction over a CSV/Parquet job feed.")
+    parser.add_argument("input", help="Input .csv or .parquet with Experience, Job Title, Location")
+    parser.add_argument("output", help="Output .csv or .parquet")
+    parser.add_argument("--model", default="models/salary_model.pkl", help="Saved pipeline")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Rows per chunk")
+    parser.add_argument("--n-jobs", type=int, default=None, help="Parallel jobs for a random forest (-1 = all cores); ignored with a warning for "
+                             "gradient boosting, which uses OMP_NUM_THREADS")
+    args = parser.parse_args()
+
+    predict_file(args.input, args.output, model_path=args.model, chunk_size=args.chunk_size, n_jobs=args.n_jobs)
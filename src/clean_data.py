@@ -1,44 +1,344 @@
 import pandas as pd
 import numpy as np
 import re
+import time
+import argparse
+import hashlib
+import json
+import os
+import glob
+import io
+import shutil
+from urllib.parse import quote, unquote
+from skill_index import explode_skills, SkillTableWriter, load_skill_vocab, skill_table_path, skill_table_is_fresh
+from skill_sketch import (UNKNOWN_MONTH, posting_months, update_month_sketches, save_skill_sketches,
+                          load_skill_sketches, skill_sketches_are_fresh)
+from trends import chunk_trends, merge_trends, save_trends, load_trends, trends_are_fresh
+from shared_dataset import SharedDatasetWriter, shared_dataset_path, shared_dataset_is_fresh
 
-def clean_data(input_path, output_path):
-    print(f"Loading data from {input_path}...")
-    df = pd.read_csv(input_path)
-    
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # the columnar artifact is optional
+    pa = None
+
+# Bump whenever the cleaning logic changes so incremental runs rebuild from scratch
+CLEANING_VERSION = 1
+WATERMARK_SUFFIX = ".watermark.json"
+# Raw bytes hashed before the watermark offset to detect rewritten history
+WATERMARK_TAIL_BYTES = 64 * 1024
+
+# Typed schema of the columnar (Parquet) copy of the cleaned data
+CATEGORICAL_COLUMNS = ['Job Title', 'Location', 'Experience']
+CLEANED_SCHEMA = pa.schema([
+    ('Job_ID', pa.int64()),
+    ('Job Title', pa.dictionary(pa.int32(), pa.string())),
+    ('Company', pa.string()),
+    ('Location', pa.dictionary(pa.int32(), pa.string())),
+    ('Salary', pa.string()),
+    ('Skills', pa.string()),
+    ('Experience', pa.dictionary(pa.int32(), pa.string())),
+    ('Posted Date', pa.timestamp('ms')),
+    ('Avg_Salary_Million', pa.float32()),
+    ('Exp_Level', pa.int8()),
+]) if pa is not None else None
+
+# Partition keys of the columnar copy -> directory name ('month' is the 'YYYY-MM' of Posted Date)
+PARTITION_KEYS = {'month': 'month', 'location': 'Location'}
+PARTITION_CHOICES = ['none', 'month', 'month,location']
+
+
+def extract_avg_salary(salary_str):
+    """Reference (row-at-a-time) salary parser, kept for benchmarking."""
+    if pd.isna(salary_str): return np.nan
+    # Regex to find numbers
+    matches = re.findall(r'\d+', str(salary_str))
+    if len(matches) >= 2:
+        low = float(matches[0])
+        high = float(matches[1])
+        return (low + high) / 2
+    elif len(matches) == 1:
+        return float(matches[0])
+    return np.nan
+
+
+def parse_avg_salary(salary):
+    """Vectorized equivalent of `extract_avg_salary` over a whole Series.
+
+    All values are joined into one NUL-separated UTF-8 buffer and tokenized
+    with numpy: digit runs are located by position, valued with a weighted
+    bincount, and the first/second run of every row give "low-high" (mean),
+    a single value, or NaN when the row has no digits. The few rows this
+    arithmetic cannot reproduce exactly (non-ASCII text, where `\\d` also
+    matches other scripts' digits, and runs of more than 15 digits) go
+    through `extract_avg_salary`.
+    """
+    if not pd.api.types.is_string_dtype(salary):
+        salary = salary.astype(str).where(salary.notna(), '')
+    values = salary.to_numpy(dtype=object, na_value='')
+    result = np.full(len(values), np.nan)
+
+    text = "\x00".join(values)
+    if text.count("\x00") != max(len(values) - 1, 0):
+        # A NUL inside a value would shift the row boundaries; for the regex it is just a separator
+        text = "\x00".join(value.replace("\x00", " ") for value in values)
+    buf = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+    row_end = np.flatnonzero(buf == 0)
+    slow = [np.searchsorted(row_end, np.flatnonzero(buf >= 128))]
+    pos = np.flatnonzero((buf - np.uint8(48)) < 10)
+
+    if len(pos):
+        # Group consecutive digit positions into runs and compute each run's value
+        new_run = np.empty(len(pos), dtype=bool)
+        new_run[0] = True
+        np.not_equal(np.diff(pos), 1, out=new_run[1:])
+        run_first = np.flatnonzero(new_run)
+        run_last = np.append(run_first[1:] - 1, len(pos) - 1)
+        run = np.cumsum(new_run) - 1
+        place = pos[run_last][run] - pos
+        with np.errstate(over='ignore', invalid='ignore'):
+            value = np.bincount(run, weights=(buf[pos] - 48) * 10.0 ** place)
+
+        # Map runs back to rows and keep the first two runs of every row
+        run_row = np.searchsorted(row_end, pos[run_first])
+        first = np.flatnonzero(np.r_[True, run_row[1:] != run_row[:-1]])
+        rows = run_row[first]
+        has_high = first + 1 < len(run_row)
+        has_high[has_high] = run_row[first[has_high] + 1] == rows[has_high]
+        low = value[first]
+        high = value[np.minimum(first + 1, len(value) - 1)]
+        result[rows] = np.where(has_high, (low + high) / 2, low)
+        # Longer runs are not exact as sums of powers of ten in float64
+        slow.append(run_row[run_last - run_first >= 15])
+
+    for row in np.unique(np.concatenate(slow)):
+        result[row] = extract_avg_salary(values[row])
+    return pd.Series(result, index=salary.index)
+
+
+def benchmark_salary_parser(input_path, sizes=(1_000_000, 10_000_000)):
+    """Compare `Series.apply(extract_avg_salary)` with `parse_avg_salary`."""
+    sample = pd.read_csv(input_path, usecols=['Salary'])['Salary']
+    for n in sizes:
+        salary = pd.Series(np.resize(sample.to_numpy(dtype=object), n))
+
+        start = time.perf_counter()
+        expected = salary.apply(extract_avg_salary)
+        t_apply = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parsed = parse_avg_salary(salary)
+        t_vec = time.perf_counter() - start
+
+        same = np.array_equal(expected.to_numpy(), parsed.to_numpy(), equal_nan=True)
+        print(f"{n:>12,} rows | apply: {t_apply:7.2f}s | vectorized: {t_vec:6.2f}s | "
+              f"speedup: {t_apply / t_vec:5.1f}x | identical: {same}")
+
+
+def apply_cleaned_dtypes(df):
+    """Cast cleaned columns to their compact dtypes (idempotent)."""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    if 'Posted Date' in df.columns:
+        df['Posted Date'] = pd.to_datetime(df['Posted Date'])
+    if 'Avg_Salary_Million' in df.columns:
+        df['Avg_Salary_Million'] = df['Avg_Salary_Million'].astype('float32')
+    if 'Exp_Level' in df.columns:
+        df['Exp_Level'] = df['Exp_Level'].astype('Int8')
+    return df
+
+
+def columnar_path(csv_path):
+    """Parquet dataset directory that sits next to a cleaned CSV."""
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def _columnar_parts(csv_path):
+    return sorted(glob.glob(os.path.join(columnar_path(csv_path), "**", "part-*.parquet"), recursive=True))
+
+
+def artifact_is_fresh(csv_path, *paths):
+    """True when the derived files in paths exist and the newest was written after the cleaned CSV.
+
+    Only the newest file counts, since an incremental run rewrites some partitions
+    and leaves the others with their old mtime.
+
+    Freshness is judged by mtime only: copying or restoring files (cp without -p, a
+    backup restore, a git checkout) can make a stale artifact look fresh or a fresh one
+    stale, so rebuild the artifacts after moving data around.
+    """
+    if not paths or not os.path.exists(csv_path) or not all(os.path.exists(path) for path in paths):
+        return False
+    return max(os.path.getmtime(path) for path in paths) >= os.path.getmtime(csv_path)
+
+
+def _columnar_is_fresh(csv_path):
+    """True when the Parquet copy exists and was written after the CSV."""
+    return pa is not None and artifact_is_fresh(csv_path, *_columnar_parts(csv_path))
+
+
+def parse_partition_by(value):
+    """'none' / 'month' / 'month,location' -> list of partition keys."""
+    keys = [] if value in (None, '', 'none') else [key.strip() for key in value.split(',')]
+    unknown = [key for key in keys if key not in PARTITION_KEYS]
+    if unknown:
+        raise ValueError(f"Unknown partition key(s) {unknown}, expected some of {list(PARTITION_KEYS)}")
+    return keys
+
+
+def _partitions(typed, months, partition_by):
+    """(relative directory, rows) for every partition of one cleaned chunk."""
+    if not partition_by:
+        yield '', typed
+        return
+    values = {'month': months, 'location': typed['Location'].astype(str).to_numpy()}
+    for key, rows in typed.groupby([values[k] for k in partition_by], sort=True):
+        key = key if isinstance(key, tuple) else (key,)
+        yield os.path.join(*(f"{PARTITION_KEYS[k]}={quote(str(v), safe='')}" for k, v in zip(partition_by, key))), rows
+
+
+def _partition_values(part, root):
+    """{directory name: value} of a part file, e.g. {'month': '2024-01', 'Location': 'Ha Noi'}."""
+    values = {}
+    for segment in os.path.relpath(os.path.dirname(part), root).split(os.sep):
+        name, sep, value = segment.partition('=')
+        if sep:
+            values[name] = unquote(value)
+    return values
+
+
+def select_parts(csv_path, since=None, until=None, locations=None):
+    """Part files that may hold rows with `since <= Posted Date < until` in `locations`.
+
+    Decided from the partition directories alone: month partitions
+    outside the range (and the unknown-month partition whenever a bound
+    is given) and Location partitions not in `locations` are skipped
+    without being opened. Unpartitioned parts are always kept.
+    """
+    root = columnar_path(csv_path)
+    since = pd.Timestamp(since) if since is not None else None
+    until = pd.Timestamp(until) if until is not None else None
+    selected = []
+    for part in _columnar_parts(csv_path):
+        values = _partition_values(part, root)
+        month = values.get('month')
+        if month is not None and (since is not None or until is not None):
+            if month == UNKNOWN_MONTH:
+                continue
+            period = pd.Period(month, 'M')
+            if since is not None and (period + 1).start_time <= since:
+                continue
+            if until is not None and period.start_time >= until:
+                continue
+        location = values.get('Location')
+        if locations is not None and location is not None and location not in locations:
+            continue
+        selected.append(part)
+    return selected
+
+
+def available_months(csv_path="data/vietnam_it_jobs_cleaned.csv"):
+    """Sorted 'YYYY-MM' months that have postings (from the month partitions when present)."""
+    if _columnar_is_fresh(csv_path):
+        root = columnar_path(csv_path)
+        months = {_partition_values(part, root).get('month') for part in _columnar_parts(csv_path)}
+        if None not in months:
+            return sorted(months - {UNKNOWN_MONTH})
+    df = load_cleaned_data(csv_path, columns=['Posted Date'])
+    if df is None:
+        return []
+    return sorted(set(posting_months(df['Posted Date'])) - {UNKNOWN_MONTH})
+
+
+def _filter_rows(df, since=None, until=None, locations=None):
+    """Rows with `since <= Posted Date < until` and Location in `locations`."""
+    mask = np.ones(len(df), dtype=bool)
+    if since is not None:
+        mask &= (df['Posted Date'] >= pd.Timestamp(since)).to_numpy()
+    if until is not None:
+        mask &= (df['Posted Date'] < pd.Timestamp(until)).to_numpy()
+    if locations is not None:
+        mask &= df['Location'].isin(list(locations)).to_numpy()
+    return df if mask.all() else df[mask].reset_index(drop=True)
+
+
+def _read_columns(columns, since, until, locations, extra=()):
+    """Requested columns plus those needed to filter (None reads everything)."""
+    if columns is None:
+        return None
+    needed = list(extra) + (['Posted Date'] if since is not None or until is not None else []) \
+        + (['Location'] if locations is not None else [])
+    return list(columns) + [c for c in dict.fromkeys(needed) if c not in columns]
+
+
+def load_cleaned_data(csv_path="data/vietnam_it_jobs_cleaned.csv", columns=None,
+                      since=None, until=None, locations=None):
+    """Load cleaned postings, preferring the typed Parquet copy over the CSV.
+
+    `since`/`until` (Posted Date, `until` exclusive) and `locations`
+    restrict the rows; on a partitioned Parquet copy the partitions that
+    cannot match are not read at all. Rows come back in `Job_ID` order
+    whatever the layout. Returns None when neither copy exists.
+    """
+    if _columnar_is_fresh(csv_path):
+        read_columns = _read_columns(columns, since, until, locations, extra=['Job_ID'])
+        parts = select_parts(csv_path, since, until, locations)
+        if parts:
+            table = pq.ParquetDataset(parts, partitioning=None).read(columns=read_columns)
+        else:
+            table = CLEANED_SCHEMA.empty_table().select(read_columns or CLEANED_SCHEMA.names)
+        df = table.to_pandas()
+        if not df['Job_ID'].is_monotonic_increasing:
+            df = df.sort_values('Job_ID', ignore_index=True)
+    elif os.path.exists(csv_path):
+        df = pd.read_csv(csv_path, usecols=_read_columns(columns, since, until, locations))
+    else:
+        return None
+    df = _filter_rows(apply_cleaned_dtypes(df), since, until, locations)
+    return df if columns is None or list(df.columns) == list(columns) else df[list(columns)]
+
+
+def iter_cleaned_chunks(csv_path="data/vietnam_it_jobs_cleaned.csv", columns=None, chunksize=500_000,
+                        since=None, until=None, locations=None):
+    """Stream cleaned postings as typed frames of at most `chunksize` rows.
+
+    Same source preference, filters and partition pruning as
+    `load_cleaned_data` (chunks are in partition order, not `Job_ID`
+    order); memory stays bounded by the chunk size. Yields nothing when
+    neither copy exists.
+    """
+    read_columns = _read_columns(columns, since, until, locations)
+    if _columnar_is_fresh(csv_path):
+        chunks = (batch.to_pandas() for part in select_parts(csv_path, since, until, locations)
+                  for batch in pq.ParquetFile(part).iter_batches(batch_size=chunksize, columns=read_columns))
+    elif os.path.exists(csv_path):
+        chunks = pd.read_csv(csv_path, usecols=read_columns, chunksize=chunksize)
+    else:
+        return
+    for chunk in chunks:
+        chunk = _filter_rows(apply_cleaned_dtypes(chunk), since, until, locations)
+        if len(chunk):
+            yield chunk if columns is None or list(chunk.columns) == list(columns) else chunk[list(columns)]
+
+
+def clean_chunk(df):
+    """Apply the cleaning steps to one frame of raw postings (in place)."""
     # 1. Handle Missing Values
-    print("Handling missing values...")
     # Drop rows without Salary or Location (Critical info)
-    initial_len = len(df)
     df.dropna(subset=['Salary', 'Location'], inplace=True)
-    print(f"Dropped {initial_len - len(df)} rows with missing Salary/Location.")
     
     # Fill missing Skills with 'Unspecified'
     df['Skills'] = df['Skills'].fillna('Unspecified')
 
     # 2. Parse Salary Column
     # Expected format: "15-25 millions" -> Extract numbers
-    print("Parsing salary...")
-    
-    def extract_avg_salary(salary_str):
-        if pd.isna(salary_str): return np.nan
-        # Regex to find numbers
-        matches = re.findall(r'\d+', str(salary_str))
-        if len(matches) >= 2:
-            low = float(matches[0])
-            high = float(matches[1])
-            return (low + high) / 2
-        elif len(matches) == 1:
-            return float(matches[0])
-        return np.nan
-
-    df['Avg_Salary_Million'] = df['Salary'].apply(extract_avg_salary)
+    df['Avg_Salary_Million'] = parse_avg_salary(df['Salary'])
     
     # Drop rows where salary parsing failed
     df.dropna(subset=['Avg_Salary_Million'], inplace=True)
 
     # 3. Standardize Text
-    print("Standardizing text...")
     df['Skills'] = df['Skills'].str.lower().str.strip()
     df['Job Title'] = df['Job Title'].str.strip()
 
@@ -47,16 +347,282 @@ def clean_data(input_path, output_path):
     exp_order = {'Fresher': 1, 'Junior': 2, 'Senior': 3, 'Lead': 4, 'Manager': 5}
     df['Exp_Level'] = df['Experience'].map(exp_order)
 
-    # Save cleaned data
+    return df
+
+
+def _tail_hash(f, offset, header):
+    """Hash of the header plus the raw bytes just before `offset`."""
+    f.seek(max(len(header), offset - WATERMARK_TAIL_BYTES))
+    digest = hashlib.sha256(header)
+    digest.update(f.read(offset - f.tell()))
+    return digest.hexdigest()
+
+
+def _complete_end(path, size):
+    """Byte offset just past the last newline in the first `size` bytes of `path`."""
+    with open(path, 'rb') as f:
+        pos = size
+        while pos > 0:
+            start = max(0, pos - WATERMARK_TAIL_BYTES)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            pos = start
+    return 0
+
+
+class _BoundedReader(io.RawIOBase):
+    """Binary file view that reports end of file at byte `end`."""
+
+    def __init__(self, f, end):
+        self._f = f
+        self._end = end
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._f.read(max(0, min(len(buffer), self._end - self._f.tell())))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _read_watermark(output_path):
+    path = output_path + WATERMARK_SUFFIX
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _resume_offset(input_path, output_path, partition_by=()):
+    """Byte offset of the first raw row not yet cleaned, or 0 for a full rebuild."""
+    watermark = _read_watermark(output_path)
+    if watermark is None or not os.path.exists(output_path):
+        print("No watermark found, running a full rebuild.")
+        return 0
+    if watermark.get('cleaning_version') != CLEANING_VERSION:
+        print(f"Cleaning logic changed (v{watermark.get('cleaning_version')} -> v{CLEANING_VERSION}), "
+              "running a full rebuild.")
+        return 0
+
+    if pa is not None and not _columnar_is_fresh(output_path):
+        print("Columnar copy is missing or stale, running a full rebuild.")
+        return 0
+    if pa is not None and watermark.get('partition_by', []) != list(partition_by):
+        print(f"Partition layout changed ({watermark.get('partition_by', [])} -> {list(partition_by)}), "
+              "running a full rebuild.")
+        return 0
+    if not skill_table_is_fresh(output_path):
+        print("Skill table is missing or stale, running a full rebuild.")
+        return 0
+    if not skill_sketches_are_fresh(output_path):
+        print("Skill sketches are missing or stale, running a full rebuild.")
+        return 0
+    if not trends_are_fresh(output_path):
+        print("Trend arrays are missing or stale, running a full rebuild.")
+        return 0
+    if not shared_dataset_is_fresh(output_path):
+        print("Memory-mapped columns are missing or stale, running a full rebuild.")
+        return 0
+
+    offset = watermark['raw_bytes']
+    if os.path.getsize(input_path) < offset:
+        print("Raw file is smaller than the watermark, running a full rebuild.")
+        return 0
+    with open(input_path, 'rb') as f:
+        header = f.readline()
+        if _tail_hash(f, offset, header) != watermark['tail_hash']:
+            print("Raw file history changed since the watermark, running a full rebuild.")
+            return 0
+    return offset
+
+
+def _write_watermark(input_path, output_path, offset, raw_rows, cleaned_rows, max_posted_date, partition_by=()):
+    with open(input_path, 'rb') as f:
+        header = f.readline()
+        tail_hash = _tail_hash(f, offset, header)
+    watermark = {
+        'cleaning_version': CLEANING_VERSION,
+        'raw_bytes': offset,
+        'raw_rows': raw_rows,
+        'cleaned_rows': cleaned_rows,
+        'max_posted_date': max_posted_date,
+        'partition_by': list(partition_by),
+        'tail_hash': tail_hash
+    }
+    with open(output_path + WATERMARK_SUFFIX, 'w') as f:
+        json.dump(watermark, f, indent=2)
+
+
+def _next_part_number(csv_path):
+    """Part number for a new run: one past the highest existing part in any partition."""
+    numbers = [int(os.path.basename(part)[5:-8]) for part in _columnar_parts(csv_path)]
+    return max(numbers) + 1 if numbers else 0
+
+
+def clean_data(input_path, output_path, chunksize=None, incremental=False, partition_by=('month',)):
+    """Clean `input_path` into `output_path`.
+
+    With `chunksize`, the raw CSV is streamed and each cleaned chunk is
+    appended to the output, so peak memory is proportional to the chunk
+    size instead of the file size.
+
+    Every run records a watermark (raw byte offset, row counts, max
+    `Posted Date` and a hash of the bytes before the offset) next to the
+    output. With `incremental=True`, only raw rows appended after the
+    watermark are cleaned and appended; a full rebuild happens when the
+    watermark is missing, the raw history changed, or `CLEANING_VERSION`
+    was bumped.
+
+    Cleaned rows get a sequential `Job_ID`, and a normalized job-to-skill
+    table with integer skill ids is appended chunk by chunk to a new part
+    in `skill_table_path(output_path)` (plus the skill dictionary), along with mergeable top-K skill
+    sketches per posting month (`skill_sketch_path(output_path)`) and
+    daily trend arrays per skill, title and location (`trends_path(output_path)`).
+
+    When pyarrow is installed, the cleaned rows are also written to a typed
+    Parquet dataset (`columnar_path(output_path)`) that `load_cleaned_data`
+    prefers over the CSV. It is partitioned by the keys in `partition_by`
+    (posting month and/or Location), e.g. `month=2024-01/Location=Ha%20Noi/`,
+    with one part file per run in every partition the run touched, so
+    readers can skip partitions outside their date range or locations.
+    Changing the layout forces a full rebuild.
+
+    The cleaned rows are also appended to memory-mappable column arrays
+    (`shared_dataset_path(output_path)`) that the dashboard maps read-only;
+    incremental runs only extend them with the new rows.
+    """
+    partition_by = list(partition_by)
+    print(f"Loading data from {input_path}...")
+    # Only clean up to the current end of file; rows appended meanwhile are picked up by the next run.
+    # Incremental runs also hold back a last line without a newline (it may still be being written):
+    # the watermark stops at its start, so the next run reads it whole
+    raw_size = os.path.getsize(input_path)
+    if incremental:
+        raw_size = _complete_end(input_path, raw_size)
+    offset = _resume_offset(input_path, output_path, partition_by) if incremental else 0
+    previous = _read_watermark(output_path) if offset else {}
+    if offset >= raw_size:
+        print("No new rows since the last run.")
+        return 0
+    if offset:
+        print(f"Resuming after {previous['raw_rows']:,} already cleaned raw rows...")
+
+    # Columnar copy: a full rebuild starts a fresh dataset, incremental runs add a part per partition
+    writers = {}
+    if pa is not None:
+        parquet_dir = columnar_path(output_path)
+        if not offset:
+            shutil.rmtree(parquet_dir, ignore_errors=True)
+        os.makedirs(parquet_dir, exist_ok=True)
+        part_name = f"part-{_next_part_number(output_path):05d}.parquet"
+    else:
+        print("pyarrow not installed, skipping the columnar copy.")
+
+    # Normalized skill table: every run appends its pairs to a new part, chunk by chunk
+    skill_writer = SkillTableWriter(output_path, rebuild=not offset)
+    vocab = load_skill_vocab(output_path) if offset else []
+    sketches = load_skill_sketches(output_path) if offset else {}
+    trends = load_trends(output_path) if offset else None
+    shared_writer = SharedDatasetWriter(shared_dataset_path(output_path), rebuild=not offset)
+
+    rows_in = rows_out = 0
+    sample = None
+    max_posted_date = previous.get('max_posted_date')
+    start = time.perf_counter()
     print(f"Saving cleaned data to {output_path}...")
-    df.to_csv(output_path, index=False)
-    
+    with open(input_path, 'rb') as raw, \
+            open(output_path, 'a' if offset else 'w', newline='', encoding='utf-8') as f:
+        if offset:
+            columns = pd.read_csv(raw, nrows=0).columns
+            raw.seek(offset)
+            reader = pd.read_csv(io.BufferedReader(_BoundedReader(raw, raw_size)), header=None, names=columns,
+                                 chunksize=chunksize)
+        else:
+            reader = pd.read_csv(io.BufferedReader(_BoundedReader(raw, raw_size)), chunksize=chunksize)
+        if chunksize:
+            print(f"Streaming in chunks of {chunksize:,} rows...")
+        chunks = reader if chunksize else [reader]
+
+        for i, chunk in enumerate(chunks):
+            n_raw = len(chunk)
+            chunk = clean_chunk(chunk)
+            next_id = previous.get('cleaned_rows', 0) + rows_out
+            chunk.insert(0, 'Job_ID', np.arange(next_id, next_id + len(chunk)))
+            chunk_jobs, chunk_skills, vocab = explode_skills(chunk['Skills'], chunk['Job_ID'], vocab)
+            skill_writer.append(chunk_jobs, chunk_skills)
+            chunk_rows = chunk_jobs - next_id
+            months = posting_months(chunk['Posted Date'])
+            update_month_sketches(sketches, months[chunk_rows], chunk_skills, vocab)
+            trends = merge_trends(trends, chunk_trends(chunk, chunk_rows, chunk_skills, vocab))
+            chunk.to_csv(f, header=(i == 0 and not offset), index=False)
+            typed = apply_cleaned_dtypes(chunk.copy())
+            shared_writer.append(typed)
+            if pa is not None and len(chunk):
+                for part_dir, rows in _partitions(typed[CLEANED_SCHEMA.names], months, partition_by):
+                    if part_dir not in writers:
+                        os.makedirs(os.path.join(parquet_dir, part_dir), exist_ok=True)
+                        writers[part_dir] = pq.ParquetWriter(os.path.join(parquet_dir, part_dir, part_name),
+                                                             CLEANED_SCHEMA)
+                    writers[part_dir].write_table(pa.Table.from_pandas(rows, schema=CLEANED_SCHEMA,
+                                                                       preserve_index=False))
+
+            rows_in += n_raw
+            rows_out += len(chunk)
+            if sample is None:
+                sample = chunk[['Job Title', 'Location', 'Experience', 'Avg_Salary_Million']].head()
+            if len(chunk):
+                chunk_max = str(chunk['Posted Date'].max())
+                max_posted_date = max(max_posted_date or chunk_max, chunk_max)
+            elapsed = time.perf_counter() - start
+            print(f"  chunk {i + 1}: {rows_in:,} rows read, {rows_out:,} kept "
+                  f"({rows_in / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    for writer in writers.values():
+        writer.close()
+    if writers:
+        print(f"Saved columnar copy to {parquet_dir} ({len(writers)} partition(s), {part_name})")
+
+    skill_writer.close(vocab)
+    print(f"Saved skill table ({len(vocab):,} skills) to {skill_table_path(output_path)}")
+    print(f"Saved skill sketches ({len(sketches)} months) to {save_skill_sketches(output_path, sketches)}")
+    if trends is not None:
+        print(f"Saved trend arrays ({len(trends['postings'])} days) to {save_trends(output_path, trends)}")
+    print(f"Published memory-mapped columns to {shared_writer.close()}")
+
+    _write_watermark(input_path, output_path, raw_size,
+                     previous.get('raw_rows', 0) + rows_in,
+                     previous.get('cleaned_rows', 0) + rows_out,
+                     max_posted_date, partition_by)
+
+    elapsed = time.perf_counter() - start
     print("\nData Sample:")
-    print(df[['Job Title', 'Location', 'Experience', 'Avg_Salary_Million']].head())
-    print("\nData Info:")
-    print(df.info())
+    print(sample)
+    print("\nSummary:")
+    print(f"Rows read: {rows_in:,}")
+    print(f"Rows kept: {rows_out:,} (dropped {rows_in - rows_out:,} with missing/unparseable Salary or Location)")
+    print(f"Elapsed: {elapsed:.2f}s ({rows_in / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    return rows_out
 
 if __name__ == "__main__":
-    input_csv = "data/vietnam_it_jobs.csv"
-    output_csv = "data/vietnam_it_jobs_cleaned.csv"
-    clean_data(input_csv, output_csv)
+    parser = argparse.ArgumentParser(description="Clean the raw IT job postings.")
+    parser.add_argument("--input", default="data/vietnam_it_jobs.csv", help="Raw CSV")
+    parser.add_argument("--output", default="data/vietnam_it_jobs_cleaned.csv", help="Cleaned CSV")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Stream the raw CSV in chunks of this many rows (bounded memory)")
+    parser.add_argument("--partition-by", choices=PARTITION_CHOICES, default="month",
+                        help="Partition the Parquet copy by posting month and optionally Location")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only clean raw rows appended since the last run's watermark")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Benchmark the vectorized salary parser at 1M and 10M rows instead of cleaning")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_salary_parser(args.input)
+    else:
+        clean_data(args.input, args.output, chunksize=args.chunksize, incremental=args.incremental,
+                   partition_by=parse_partition_by(args.partition_by))
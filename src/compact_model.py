@@ -0,0 +1,263 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import shutil
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+COMPACT_FORMAT_VERSION = 1
+_ARRAYS = ['left', 'right', 'feature', 'threshold', 'value', 'roots']
+# Rows evaluated per traversal block (memory ~ n_trees * BLOCK_ROWS nodes)
+BLOCK_ROWS = 8192
+
+
+def compact_model_path(model_path):
+    """Directory of the compact artifact that sits next to a pickled pipeline."""
+    return os.path.splitext(model_path)[0] + "_compact"
+
+
+def load_compact_model(model_path):
+    """`CompactForest` for `model_path` if its compact artifact is up to date, else None."""
+    meta_path = os.path.join(compact_model_path(model_path), "meta.json")
+    if not os.path.exists(meta_path) or (
+            os.path.exists(model_path) and os.path.getmtime(meta_path) < os.path.getmtime(model_path)):
+        return None
+    return CompactForest.load(compact_model_path(model_path))
+
+
+def export_compact_model(model_pipeline, out_dir):
+    """Flatten the random forest pipeline into plain .npy arrays + meta.json.
+
+    All trees are concatenated into one node table (child indices are
+    global, -1 marks a leaf) and `roots` holds each tree's first node. The
+    encoder category lists go to meta.json, so `CompactForest` needs
+    neither sklearn nor pickle to predict.
+    """
+    preprocessor = model_pipeline.named_steps['preprocessor']
+    forest = model_pipeline.named_steps['regressor']
+    transformers = {name: (enc, cols) for name, enc, cols in preprocessor.transformers_}
+    if set(transformers) != {'ord', 'cat'} or list(transformers['ord'][1]) != ['Experience'] \
+            or list(transformers['cat'][1]) != ['Job Title', 'Location'] \
+            or not hasattr(forest, 'estimators_'):
+        raise ValueError("Compact export supports the OrdinalEncoder + OneHotEncoder random forest pipeline only")
+
+    ord_enc, cat_enc = transformers['ord'][0], transformers['cat'][0]
+    nodes = {name: [] for name in _ARRAYS if name != 'roots'}
+    roots = []
+    offset = 0
+    for est in forest.estimators_:
+        tree = est.tree_
+        is_leaf = tree.children_left < 0
+        roots.append(offset)
+        nodes['left'].append(np.where(is_leaf, -1, tree.children_left + offset))
+        nodes['right'].append(np.where(is_leaf, -1, tree.children_right + offset))
+        nodes['feature'].append(np.where(is_leaf, 0, tree.feature))
+        nodes['threshold'].append(tree.threshold)
+        nodes['value'].append(tree.value[:, 0, 0])
+        offset += tree.node_count
+
+    arrays = {
+        'left': np.concatenate(nodes['left']).astype(np.int32),
+        'right': np.concatenate(nodes['right']).astype(np.int32),
+        'feature': np.concatenate(nodes['feature']).astype(np.int32),
+        'threshold': np.concatenate(nodes['threshold']).astype(np.float64),
+        'value': np.concatenate(nodes['value']).astype(np.float64),
+        'roots': np.asarray(roots, dtype=np.int64),
+    }
+    meta = {
+        'format_version': COMPACT_FORMAT_VERSION,
+        'n_trees': len(roots),
+        'n_nodes': offset,
+        'experience_levels': [str(c) for c in ord_enc.categories_[0]],
+        'job_titles': [str(c) for c in cat_enc.categories_[0]],
+        'locations': [str(c) for c in cat_enc.categories_[1]],
+    }
+
+    # Write to a temp dir and swap it in, so readers never see a partial artifact
+    tmp_dir = out_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name, arr in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), arr)
+    with open(os.path.join(tmp_dir, "meta.json"), 'w') as f:
+        json.dump(meta, f, indent=2)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    return out_dir
+
+
+class CompactForest:
+    """Pure-NumPy predictor over an artifact written by `export_compact_model`.
+
+    Arrays are memory-mapped read-only by default, so several processes
+    loading the same directory share one copy of the model pages.
+    """
+
+    def __init__(self, arrays, meta):
+        self.meta = meta
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+        self.experience_levels = meta['experience_levels']
+        self.job_titles = meta['job_titles']
+        self.locations = meta['locations']
+        self.n_features = 1 + len(self.job_titles) + len(self.locations)
+        self._exp_index = pd.Index(self.experience_levels)
+        self._title_index = pd.Index(self.job_titles)
+        self._loc_index = pd.Index(self.locations)
+
+    @classmethod
+    def load(cls, model_dir, mmap=True):
+        with open(os.path.join(model_dir, "meta.json")) as f:
+            meta = json.load(f)
+        if meta.get('format_version') != COMPACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact model format: {meta.get('format_version')}")
+        arrays = {name: np.load(os.path.join(model_dir, f"{name}.npy"), mmap_mode='r' if mmap else None)
+                  for name in _ARRAYS}
+        return cls(arrays, meta)
+
+    def _codes(self, X):
+        exp = self._exp_index.get_indexer(X['Experience'])
+        if (exp < 0).any():
+            unknown = sorted(set(map(str, np.asarray(X['Experience'], dtype=object)[exp < 0])))
+            raise ValueError(f"Found unknown categories {unknown} in column 'Experience'")
+        return exp, self._title_index.get_indexer(X['Job Title']), self._loc_index.get_indexer(X['Location'])
+
+    def _features(self, exp, title, loc):
+        n = len(exp)
+        out = np.zeros((n, self.n_features), dtype=np.float32)
+        out[:, 0] = exp
+        rows = np.arange(n)
+        # Unknown titles/locations (code -1) stay all-zero, like handle_unknown='ignore'
+        known = title >= 0
+        out[rows[known], 1 + title[known]] = 1
+        known = loc >= 0
+        out[rows[known], 1 + len(self.job_titles) + loc[known]] = 1
+        return out
+
+    def encode(self, X):
+        """Dense feature matrix matching the pipeline's ColumnTransformer output."""
+        return self._features(*self._codes(X))
+
+    def _unique_features(self, X):
+        """Features of the distinct input combinations plus the row -> combination map.
+
+        Every feature is categorical, so a batch of any size has at most
+        |Experience| x |Job Title| x |Location| distinct rows to evaluate.
+        """
+        exp, title, loc = self._codes(X)
+        n_title, n_loc = len(self.job_titles) + 1, len(self.locations) + 1
+        key = (exp * n_title + title + 1) * n_loc + loc + 1
+        uniq, inverse = np.unique(key, return_inverse=True)
+        u_exp, rest = np.divmod(uniq, n_title * n_loc)
+        u_title, u_loc = np.divmod(rest, n_loc)
+        return self._features(u_exp, u_title - 1, u_loc - 1), inverse.ravel()
+
+    def _leaf_values(self, features, trees):
+        """Leaf value of every (tree, row) pair, shape (len(trees), n_rows).
+
+        All trees are walked together: one flat array holds the current
+        node of every (tree, row) pair and each step advances all pairs
+        that are still on an internal node.
+        """
+        n = len(features)
+        node = np.repeat(self.roots[trees], n)
+        row = np.tile(np.arange(n), len(trees))
+        active = np.flatnonzero(self.left[node] >= 0)
+        while len(active):
+            cur = node[active]
+            go_left = features[row[active], self.feature[cur]] <= self.threshold[cur]
+            nxt = np.where(go_left, self.left[cur], self.right[cur])
+            node[active] = nxt
+            active = active[self.left[nxt] >= 0]
+        return self.value[node].reshape(len(trees), n)
+
+    def _evaluate(self, features, n_threads=1, block_rows=BLOCK_ROWS):
+        """Leaf values of all trees for `features`, shape (n_trees, n_rows).
+
+        Rows are processed in blocks of `block_rows` to bound memory, and
+        with `n_threads` > 1 the trees are split across a thread pool.
+        """
+        n_trees = len(self.roots)
+        out = np.empty((n_trees, len(features)))
+        groups = [g for g in np.array_split(np.arange(n_trees), max(1, min(n_threads or 1, n_trees))) if len(g)]
+
+        def run(block, trees):
+            out[trees, block] = self._leaf_values(features[block], trees)
+
+        tasks = [(slice(i, i + block_rows), g) for i in range(0, len(features), block_rows) for g in groups]
+        if len(groups) == 1:
+            for task in tasks:
+                run(*task)
+        else:
+            with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+                list(pool.map(lambda task: run(*task), tasks))
+        return out
+
+    def predict_trees(self, X, n_threads=1):
+        """Per-tree predictions for a DataFrame of raw features, shape (n_trees, n_rows)."""
+        features, inverse = self._unique_features(X)
+        return self._evaluate(features, n_threads)[:, inverse]
+
+    def predict(self, X, n_threads=1):
+        """Mean of per-tree leaf values for a DataFrame of raw features."""
+        features, inverse = self._unique_features(X)
+        return self._evaluate(features, n_threads).mean(axis=0)[inverse]
+
+
+def benchmark_inference(model_path="models/salary_model.pkl", n_rows=100_000, n_single=200, n_threads=4):
+    """Compare the sklearn pipeline with CompactForest: single-row latency and batch throughput."""
+    import joblib
+    from train_model import EXP_LEVELS
+
+    pipeline = joblib.load(model_path)
+    compact = load_compact_model(model_path)
+    if compact is None:
+        compact = CompactForest.load(export_compact_model(pipeline, compact_model_path(model_path)))
+
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame({
+        'Experience': rng.choice(EXP_LEVELS, n_rows),
+        'Job Title': rng.choice(compact.job_titles, n_rows),
+        'Location': rng.choice(compact.locations, n_rows),
+    })
+
+    def single_row_ms(fn):
+        times = []
+        for i in range(n_single):
+            row = X.iloc[[i]]
+            start = time.perf_counter()
+            fn(row)
+            times.append(time.perf_counter() - start)
+        return np.median(times) * 1000
+
+    def throughput(fn):
+        start = time.perf_counter()
+        pred = fn(X)
+        return n_rows / (time.perf_counter() - start), pred
+
+    engines = [
+        ("sklearn pipeline", pipeline.predict),
+        ("compact, 1 thread", lambda df: compact.predict(df, n_threads=1)),
+        (f"compact, {n_threads} threads", lambda df: compact.predict(df, n_threads=n_threads)),
+    ]
+    reference = None
+    for name, fn in engines:
+        latency = single_row_ms(fn)
+        rate, pred = throughput(fn)
+        if reference is None:
+            reference = pred
+        diff = np.abs(pred - reference).max()
+        print(f"{name:<20} | single row: {latency:7.3f} ms | {n_rows:,} rows: {rate:12,.0f} rows/s "
+              f"| max |diff| vs sklearn: {diff:.2e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy forest engine against sklearn.")
+    parser.add_argument("--model", default="models/salary_model.pkl", help="Saved pipeline")
+    parser.add_argument("--rows", type=int, default=100_000, help="Batch size for the throughput test")
+    parser.add_argument("--threads", type=int, default=4, help="Threads for the parallel engine")
+    args = parser.parse_args()
+
+    benchmark_inference(args.model, n_rows=args.rows, n_threads=args.threads)
@@ -1,68 +1,300 @@
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
-from collections import Counter
+import json
+import time
+import hashlib
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from clean_data import iter_cleaned_chunks
+from skill_index import explode_skills
+from skill_sketch import UNKNOWN_MONTH, load_skill_sketches, merge_sketches
+from aggregates import SALARY_BIN, salary_histogram, merge_histograms, merge_keyed, histogram_quantiles, box_stats, histogram_kde
 
-def run_eda(input_path, output_dir):
-    print(f"Loading cleaned data from {input_path}...")
-    df = pd.read_csv(input_path)
-    
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Set style
-    sns.set_theme(style="whitegrid")
-    
-    # 1. Salary Distribution
+EXP_ORDER = ['Fresher', 'Junior', 'Senior', 'Lead', 'Manager']
+KDE_POINTS = 200
+MANIFEST_NAME = "_manifest.json"
+AGG_COLUMNS = ['Avg_Salary_Million', 'Experience', 'Location', 'Skills']
+
+
+def chunk_aggregates(chunk):
+    """Mergeable summary of one chunk of cleaned postings.
+
+    Salary histograms on fixed bins (overall, per Experience, per
+    Location) double as quantile sketches: quantiles, box and violin
+    statistics read from them are exact to within one `SALARY_BIN` below
+    `SALARY_MAX` (larger salaries share one overflow bin).
+    Skill counts are keyed by the chunk's own vocabulary (empty when the
+    chunk has no `Skills` column).
+    """
+    salary = chunk['Avg_Salary_Million'].to_numpy(dtype=np.float64)
+    experience = pd.Categorical(chunk['Experience'], categories=EXP_ORDER)
+    location = pd.Categorical(chunk['Location'].astype(object))
+    vocab, skill_ids = [], np.zeros(0, dtype=np.int64)
+    if 'Skills' in chunk.columns:
+        _, skill_ids, vocab = explode_skills(chunk['Skills'], np.zeros(len(chunk), dtype=np.int64))
+    return {
+        'n_rows': len(chunk),
+        'salary': salary_histogram(salary),
+        'experience': salary_histogram(salary, experience.codes, len(EXP_ORDER)),
+        'locations': [str(c) for c in location.categories],
+        'location': salary_histogram(salary, location.codes, len(location.categories)),
+        'skill_vocab': vocab,
+        'skill_counts': np.bincount(skill_ids, minlength=len(vocab)),
+    }
+
+
+def merge_eda_aggregates(a, b):
+    """Combine the summaries of two chunks/partitions (associative and commutative)."""
+    locations, location = merge_keyed(a['locations'], a['location'], b['locations'], b['location'])
+    vocab, skill_counts = merge_keyed(a['skill_vocab'], a['skill_counts'], b['skill_vocab'], b['skill_counts'])
+    return {
+        'n_rows': a['n_rows'] + b['n_rows'],
+        'salary': merge_histograms(a['salary'], b['salary']),
+        'experience': merge_histograms(a['experience'], b['experience']),
+        'locations': locations,
+        'location': location,
+        'skill_vocab': vocab,
+        'skill_counts': skill_counts,
+    }
+
+
+def _month_start(value):
+    """'YYYY-MM' when `value` falls exactly on the first of a month, else None."""
+    ts = pd.Timestamp(value)
+    return ts.strftime('%Y-%m') if ts == ts.to_period('M').start_time else None
+
+
+def _sketch_months(sketches, since=None, until=None):
+    """Months whose sketches exactly cover [since, until); None when the bounds split a month."""
+    bounds = [_month_start(b) if b is not None else '' for b in (since, until)]
+    if None in bounds:
+        return None
+    first, end = bounds
+    if not first and not end:
+        return set(sketches)
+    return {m for m in sketches if m != UNKNOWN_MONTH and first <= m and (not end or m < end)}
+
+
+def stream_eda_aggregates(input_path, chunksize=500_000, since=None, until=None):
+    """Aggregate the cleaned dataset chunk by chunk; memory is bounded by `chunksize`.
+
+    Only postings with `since <= Posted Date < until` are read (whole
+    month partitions outside the range are skipped). Skill counts come
+    from the merged per-month skill sketches written by clean_data when
+    they are fresh and the range is made of whole months, so the Skills
+    column is not read at all.
+    """
+    sketches = load_skill_sketches(input_path)
+    months = _sketch_months(sketches, since, until) if sketches is not None else None
+    columns = AGG_COLUMNS if months is None else [c for c in AGG_COLUMNS if c != 'Skills']
+    agg = None
+    for chunk in iter_cleaned_chunks(input_path, columns=columns, chunksize=chunksize, since=since, until=until):
+        part = chunk_aggregates(chunk)
+        agg = part if agg is None else merge_eda_aggregates(agg, part)
+
+    sketch = merge_sketches(sketches, months) if months else None
+    if agg is not None and sketch is not None:
+        top = sketch.top(len(sketch.counts))
+        agg['skill_vocab'] = [name for name, _ in top]
+        agg['skill_counts'] = np.array([count for _, count in top], dtype=np.int64)
+    return agg
+
+
+# 1. Salary Distribution
+def salary_distribution_data(agg):
+    counts = agg['salary'][0]
+    values = np.flatnonzero(counts) * SALARY_BIN if counts.any() else np.array([0.0])
+    lo, hi = values.min(), values.max()
+    hist, edges = np.histogram(np.arange(len(counts)) * SALARY_BIN, bins=20, range=(lo, hi), weights=counts)
+    grid = np.linspace(lo, hi, KDE_POINTS)
+    # Scale the density to counts per histogram bin, like histplot(kde=True)
+    kde = histogram_kde(counts, grid) * counts.sum() * (edges[1] - edges[0])
+    return {'hist': hist, 'edges': edges, 'grid': grid, 'kde': kde}
+
+
+def plot_salary_distribution(data, path):
     plt.figure(figsize=(10, 6))
-    sns.histplot(data=df, x='Avg_Salary_Million', bins=20, kde=True, color='skyblue')
+    edges = data['edges']
+    plt.bar(edges[:-1], data['hist'], width=np.diff(edges), align='edge', color='skyblue', edgecolor='white')
+    plt.plot(data['grid'], data['kde'], color='skyblue', linewidth=2)
     plt.title('Distribution of IT Salaries in Vietnam (Million VND)')
     plt.xlabel('Salary (Million VND)')
     plt.ylabel('Count')
-    plt.savefig(f"{output_dir}/1_salary_distribution.png")
+    plt.savefig(path)
     plt.close()
-    print(f"Saved salary distribution plot to {output_dir}/1_salary_distribution.png")
 
-    # 2. Salary by Experience Level
+
+# 2. Salary by Experience Level
+def salary_by_experience_data(agg):
+    return {'stats': [box_stats(counts, label) for label, counts in zip(EXP_ORDER, agg['experience'])
+                      if counts.sum()]}
+
+
+def plot_salary_by_experience(data, path):
     plt.figure(figsize=(10, 6))
-    # Define order
-    order = ['Fresher', 'Junior', 'Senior', 'Lead', 'Manager']
-    sns.boxplot(data=df, x='Experience', y='Avg_Salary_Million', order=order, palette='viridis')
+    ax = plt.gca()
+    boxes = ax.bxp(data['stats'], patch_artist=True, widths=0.8,
+                   medianprops={'color': '0.25'}, flierprops={'marker': 'd', 'markerfacecolor': '0.25'})
+    for patch, color in zip(boxes['boxes'], sns.color_palette('viridis', len(data['stats']))):
+        patch.set_facecolor(color)
     plt.title('Salary Ranges by Experience Level')
     plt.xlabel('Experience Level')
     plt.ylabel('Salary (Million VND)')
-    plt.savefig(f"{output_dir}/2_salary_by_experience.png")
+    plt.savefig(path)
     plt.close()
-    print(f"Saved salary by experience plot to {output_dir}/2_salary_by_experience.png")
-
-    # 3. Top Skills Analysis
-    all_skills = " ".join(df['Skills']).split(",")
-    # Clean and split again properly because some inputs might be "Python, SQL"
-    flat_skills = [s.strip() for sublist in df['Skills'].str.split(',') for s in sublist]
-    
-    skill_counts = Counter(flat_skills)
-    top_15_skills = pd.DataFrame(skill_counts.most_common(15), columns=['Skill', 'Count'])
-    
+
+
+# 3. Top Skills Analysis
+def top_skills_data(agg):
+    counts = agg['skill_counts']
+    top_ids = np.argsort(-counts, kind='stable')[:15]
+    return {'skills': [agg['skill_vocab'][i] for i in top_ids], 'counts': counts[top_ids]}
+
+
+def plot_top_skills(data, path):
+    top_15_skills = pd.DataFrame({'Skill': data['skills'], 'Count': data['counts']})
     plt.figure(figsize=(12, 8))
-    sns.barplot(data=top_15_skills, x='Count', y='Skill', palette='magma')
+    sns.barplot(data=top_15_skills, x='Count', y='Skill', hue='Skill', palette='magma', legend=False)
     plt.title('Top 15 Most In-Demand IT Skills')
     plt.xlabel('Number of Job Postings')
-    plt.savefig(f"{output_dir}/3_top_skills.png")
+    plt.savefig(path)
     plt.close()
-    print(f"Saved top skills plot to {output_dir}/3_top_skills.png")
-    
-    # 4. Salary by Location
+
+
+# 4. Salary by Location
+def salary_by_location_data(agg):
+    order = [i for i in np.argsort(agg['locations'], kind='stable') if agg['location'][i].sum() > 0]
+    hists = agg['location'][order]
+    values = np.flatnonzero(hists.sum(axis=0)) * SALARY_BIN
+    grid = np.linspace(values.min(), values.max(), KDE_POINTS) if len(values) else np.zeros(KDE_POINTS)
+    return {
+        'locations': [agg['locations'][i] for i in order],
+        'grid': grid,
+        'density': np.array([histogram_kde(h, grid) for h in hists]),
+        'quartiles': np.array([histogram_quantiles(h, [0.25, 0.5, 0.75]) for h in hists]),
+        'whiskers': np.array([[s['whislo'], s['whishi']] for s in map(box_stats, hists)]),
+    }
+
+
+def plot_salary_by_location(data, path):
     plt.figure(figsize=(10, 6))
-    sns.violinplot(data=df, x='Location', y='Avg_Salary_Million', palette='coolwarm')
+    ax = plt.gca()
+    grid = data['grid']
+    # Same scaling for every violin (equal areas), half-width 0.4 at the global peak
+    scale = 0.4 / max(data['density'].max(), 1e-12)
+    colors = sns.color_palette('coolwarm', len(data['locations']))
+    for i, (density, (q1, med, q3), (lo, hi)) in enumerate(zip(data['density'], data['quartiles'], data['whiskers'])):
+        ax.fill_betweenx(grid, i - density * scale, i + density * scale, color=colors[i], edgecolor='0.25')
+        ax.vlines(i, lo, hi, color='0.25', linewidth=1.5)
+        ax.vlines(i, q1, q3, color='0.25', linewidth=5)
+        ax.scatter([i], [med], color='white', s=12, zorder=3)
+    ax.set_xticks(range(len(data['locations'])), data['locations'])
     plt.title('Salary Distribution by Location')
     plt.xlabel('Location')
     plt.ylabel('Salary (Million VND)')
-    plt.savefig(f"{output_dir}/4_salary_by_location.png")
+    plt.savefig(path)
     plt.close()
-    print(f"Saved salary by location plot to {output_dir}/4_salary_by_location.png")
+
+
+# (file name, plot code version, aggregate -> plot data, renderer).
+# Bump a version whenever its figure's code changes to invalidate the cache.
+FIGURES = [
+    ("1_salary_distribution.png", 1, salary_distribution_data, plot_salary_distribution),
+    ("2_salary_by_experience.png", 1, salary_by_experience_data, plot_salary_by_experience),
+    ("3_top_skills.png", 1, top_skills_data, plot_top_skills),
+    ("4_salary_by_location.png", 1, salary_by_location_data, plot_salary_by_location),
+]
+
+
+def _data_hash(data, h=None):
+    """Stable hash of nested dicts/lists of arrays and scalars (full array bytes, not repr)."""
+    top = h is None
+    h = hashlib.sha256() if top else h
+    if isinstance(data, dict):
+        for key in sorted(data):
+            h.update(repr(key).encode())
+            _data_hash(data[key], h)
+    elif isinstance(data, (list, tuple)):
+        h.update(f"[{len(data)}".encode())
+        for item in data:
+            _data_hash(item, h)
+    elif isinstance(data, np.ndarray):
+        h.update(f"{data.dtype}{data.shape}".encode())
+        h.update(np.ascontiguousarray(data).tobytes())
+    else:
+        h.update(repr(data).encode())
+    return h.hexdigest() if top else None
+
+
+def _render(render, data, path):
+    sns.set_theme(style="whitegrid")
+    start = time.perf_counter()
+    render(data, path)
+    return time.perf_counter() - start
+
+
+def render_figures(agg, output_dir, n_workers=None, force=False):
+    """Render every figure that is missing or whose inputs/code changed, in parallel.
+
+    A figure's cache key is the hash of its plot data plus its code
+    version, stored in `_manifest.json` in the output directory.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    tasks = {}
+    for name, version, prepare, render in FIGURES:
+        data = prepare(agg)
+        key = f"v{version}-{_data_hash(data)}"
+        path = os.path.join(output_dir, name)
+        if manifest.get(name) == key and os.path.exists(path):
+            print(f"Unchanged, skipped {path}")
+            continue
+        tasks[name] = (key, render, data, path)
+
+    if tasks:
+        with ProcessPoolExecutor(max_workers=min(len(tasks), n_workers or os.cpu_count())) as pool:
+            futures = {name: pool.submit(_render, render, data, path) for name, (_, render, data, path) in tasks.items()}
+            for name, future in futures.items():
+                seconds = future.result()
+                manifest[name] = tasks[name][0]
+                print(f"Saved {tasks[name][3]} ({seconds:.2f}s)")
+
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return sorted(tasks)
+
+
+def run_eda(input_path, output_dir, n_workers=None, force=False, chunksize=500_000, since=None, until=None):
+    print(f"Streaming cleaned data from {input_path}...")
+    start = time.perf_counter()
+    agg = stream_eda_aggregates(input_path, chunksize=chunksize, since=since, until=until)
+    if agg is None:
+        print("Data file not found!")
+        return
+    print(f"Aggregated {agg['n_rows']:,} rows in {time.perf_counter() - start:.2f}s")
+
+    render_figures(agg, output_dir, n_workers=n_workers, force=force)
 
 if __name__ == "__main__":
-    input_csv = "data/vietnam_it_jobs_cleaned.csv"
-    output_folder = "outputs/figures"
-    run_eda(input_csv, output_folder)
+    parser = argparse.ArgumentParser(description="Render the EDA figures.")
+    parser.add_argument("--input", default="data/vietnam_it_jobs_cleaned.csv", help="Cleaned CSV")
+    parser.add_argument("--output", default="outputs/figures", help="Figure directory")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: one per figure)")
+    parser.add_argument("--force", action="store_true", help="Redraw every figure, ignoring the cache")
+    parser.add_argument("--chunksize", type=int, default=500_000, help="Rows per streamed chunk")
+    parser.add_argument("--since", default=None, help="Only postings from this Posted Date (e.g. 2024-06)")
+    parser.add_argument("--until", default=None, help="... up to this Posted Date, exclusive (e.g. 2025-01)")
+    args = parser.parse_args()
+
+    run_eda(args.input, args.output, n_workers=args.workers, force=args.force, chunksize=args.chunksize,
+            since=args.since, until=args.until)
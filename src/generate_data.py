@@ -1,107 +1,238 @@
 import pandas as pd
 import numpy as np
-import random
-from datetime import datetime, timedelta
+import argparse
+import os
+import time
+import glob
+import json
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
 
-def generate_it_jobs_data(n_samples=2000):
-    # Seed for reproducibility
-    np.random.seed(42)
-    random.seed(42)
-
-    # 1. Locations with weights (HCM & Hanoi are tech hubs)
-    locations = ['Ho Chi Minh', 'Ha Noi', 'Da Nang', 'Remote', 'Can Tho']
-    loc_weights = [0.45, 0.40, 0.10, 0.04, 0.01]
-
-    # 2. Experience Levels
-    experiences = ['Fresher', 'Junior', 'Senior', 'Lead', 'Manager']
-    exp_weights = [0.15, 0.35, 0.35, 0.10, 0.05]
-    
-    # Base salary ranges (in Million VND) per level
-    salary_map = {
-        'Fresher': (8, 15),
-        'Junior': (15, 25),
-        'Senior': (25, 50),
-        'Lead': (40, 70),
-        'Manager': (60, 100)
-    }
+# 1. Locations with weights (HCM & Hanoi are tech hubs)
+LOCATIONS = ['Ho Chi Minh', 'Ha Noi', 'Da Nang', 'Remote', 'Can Tho']
+LOC_WEIGHTS = [0.45, 0.40, 0.10, 0.04, 0.01]
+# Adjust salary based on location (HCM/Hanoi slightly higher)
+LOC_SALARY_MULT = [1.1, 1.1, 0.9, 1.05, 0.9]
+
+# 2. Experience Levels
+EXPERIENCES = ['Fresher', 'Junior', 'Senior', 'Lead', 'Manager']
+EXP_WEIGHTS = [0.15, 0.35, 0.35, 0.10, 0.05]
+
+# Base salary ranges (in Million VND) per level
+SALARY_MAP = {
+    'Fresher': (8, 15),
+    'Junior': (15, 25),
+    'Senior': (25, 50),
+    'Lead': (40, 70),
+    'Manager': (60, 100)
+}
+
+# 3. Job Titles & Associated Skills
+TITLES_SKILLS = {
+    'Backend Developer': ['Python, Django', 'Java, Spring Boot', 'Go, Microservices', 'Node.js, Express'],
+    'Frontend Developer': ['ReactJS, TypeScript', 'VueJS, Nuxt', 'Angular, RxJS', 'HTML, CSS, JS'],
+    'Fullstack Developer': ['React, Node.js, Mongo', 'Java, Angular, SQL', 'Python, VueJS, Docker'],
+    'Data Scientist': ['Python, Pandas, Scikit-learn', 'SQL, Tableau, Python', 'Python, PyTorch, AWS'],
+    'AI/ML Engineer': ['Python, TensorFlow, CV', 'Python, NLP, HuggingFace', 'C++, CUDA, Computer Vision'],
+    'DevOps Engineer': ['AWS, Docker, K8s', 'Azure, CI/CD, Terraform', 'Linux, Jenkins, Ansible'],
+    'Mobile Developer': ['Flutter, Dart', 'React Native', 'Swift, iOS', 'Kotlin, Android'],
+    'Tester/QA': ['Selenium, Python', 'Manual Testing, SQL', 'Java, Appium', 'Automation, Cypress']
+}
+
+# Posted Date range (inclusive)
+START_DATE = np.datetime64('2024-01-01')
+END_DATE = np.datetime64('2025-12-31')
+
+COLUMNS = ['Job Title', 'Company', 'Location', 'Salary', 'Skills', 'Experience', 'Posted Date']
+
+# Share of rows with missing values, to make cleaning step necessary
+MISSING_FRAC = 0.05
+
+
+def generate_it_jobs_chunk(rng, n_rows):
+    """Draw `n_rows` postings column-by-column from a numpy Generator."""
+    job_titles = list(TITLES_SKILLS.keys())
+    max_groups = max(len(groups) for groups in TITLES_SKILLS.values())
+    stack_table = np.array(
+        [groups + [''] * (max_groups - len(groups)) for groups in TITLES_SKILLS.values()],
+        dtype=object
+    )
+    n_groups = np.array([len(groups) for groups in TITLES_SKILLS.values()])
+
+    # Pick Experience first to determine Salary
+    exp_idx = rng.choice(len(EXPERIENCES), size=n_rows, p=EXP_WEIGHTS)
+
+    # Pick Location
+    loc_idx = rng.choice(len(LOCATIONS), size=n_rows, p=LOC_WEIGHTS)
+
+    # Pick Job Title, then a stack from the title's possibilities
+    title_idx = rng.integers(0, len(job_titles), size=n_rows)
+    stack_idx = (rng.random(n_rows) * n_groups[title_idx]).astype(np.int64)
+
+    # Determine Salary (Add some noise/variation)
+    min_base = np.array([SALARY_MAP[e][0] for e in EXPERIENCES])[exp_idx]
+    max_base = np.array([SALARY_MAP[e][1] for e in EXPERIENCES])[exp_idx]
+    loc_mult = np.array(LOC_SALARY_MULT)[loc_idx]
+
+    low_sal = (min_base * loc_mult + rng.uniform(-2, 2, n_rows)).astype(np.int64)
+    high_sal = (max_base * loc_mult + rng.uniform(0, 5, n_rows)).astype(np.int64)
+
+    # Ensure logical range
+    low_sal = np.maximum(low_sal, 5)
+    high_sal = np.where(high_sal <= low_sal, low_sal + 5, high_sal)
+
+    salary = pd.Series(low_sal).astype(str) + "-" + pd.Series(high_sal).astype(str) + " millions"
+
+    # Posted Date
+    n_days = int((END_DATE - START_DATE).astype(np.int64))
+    posted = START_DATE + rng.integers(0, n_days + 1, size=n_rows)
+
+    company = "Tech Company " + pd.Series(rng.integers(1, 501, size=n_rows)).astype(str)  # Anonymized
+
+    df = pd.DataFrame({
+        'Job Title': np.array(job_titles, dtype=object)[title_idx],
+        'Company': company,
+        'Location': np.array(LOCATIONS, dtype=object)[loc_idx],
+        'Salary': salary,
+        'Skills': stack_table[title_idx, stack_idx],
+        'Experience': np.array(EXPERIENCES, dtype=object)[exp_idx],
+        'Posted Date': posted.astype(str)
+    }, columns=COLUMNS)
 
-    # 3. Job Titles & Associated Skills
-    titles_skills = {
-        'Backend Developer': ['Python, Django', 'Java, Spring Boot', 'Go, Microservices', 'Node.js, Express'],
-        'Frontend Developer': ['ReactJS, TypeScript', 'VueJS, Nuxt', 'Angular, RxJS', 'HTML, CSS, JS'],
-        'Fullstack Developer': ['React, Node.js, Mongo', 'Java, Angular, SQL', 'Python, VueJS, Docker'],
-        'Data Scientist': ['Python, Pandas, Scikit-learn', 'SQL, Tableau, Python', 'Python, PyTorch, AWS'],
-        'AI/ML Engineer': ['Python, TensorFlow, CV', 'Python, NLP, HuggingFace', 'C++, CUDA, Computer Vision'],
-        'DevOps Engineer': ['AWS, Docker, K8s', 'Azure, CI/CD, Terraform', 'Linux, Jenkins, Ansible'],
-        'Mobile Developer': ['Flutter, Dart', 'React Native', 'Swift, iOS', 'Kotlin, Android'],
-        'Tester/QA': ['Selenium, Python', 'Manual Testing, SQL', 'Java, Appium', 'Automation, Cypress']
-    }
-    
-    job_titles = list(titles_skills.keys())
-
-    data = []
-
-    for _ in range(n_samples):
-        # Pick Experience first to determine Salary
-        exp = random.choices(experiences, weights=exp_weights, k=1)[0]
-        
-        # Pick Location
-        loc = random.choices(locations, weights=loc_weights, k=1)[0]
-        
-        # Pick Job Title
-        title = random.choice(job_titles)
-        
-        # Pick Skills (Random subset from the title's possibilities)
-        possible_skills_groups = titles_skills[title]
-        base_stack = random.choice(possible_skills_groups)
-        
-        # Determine Salary (Add some noise/variation)
-        min_base, max_base = salary_map[exp]
-        # Adjust salary based on location (HCM/Hanoi slightly higher)
-        loc_mult = 1.1 if loc in ['Ho Chi Minh', 'Ha Noi'] else 0.9
-        if loc == 'Remote': loc_mult = 1.05
-        
-        low_sal = int(min_base * loc_mult + random.uniform(-2, 2))
-        high_sal = int(max_base * loc_mult + random.uniform(0, 5))
-        
-        # Ensure logical range
-        if low_sal < 5: low_sal = 5
-        if high_sal <= low_sal: high_sal = low_sal + 5
-        
-        salary_str = f"{low_sal}-{high_sal} millions"
-
-        # Posted Date
-        start_date = datetime(2024, 1, 1)
-        end_date = datetime(2025, 12, 31)
-        posted_date = start_date + timedelta(days=random.randint(0, (end_date - start_date).days))
-
-        data.append({
-            'Job Title': title,
-            'Company': f"Tech Company {random.randint(1, 500)}", # Anonymized
-            'Location': loc,
-            'Salary': salary_str,
-            'Skills': base_stack,
-            'Experience': exp,
-            'Posted Date': posted_date.strftime("%Y-%m-%d")
-        })
-
-    df = pd.DataFrame(data)
     # Introduce some missing values to make cleaning step necessary
     for col in ['Salary', 'Location']:
-        df.loc[df.sample(frac=0.05).index, col] = np.nan
-        
+        df.loc[rng.random(n_rows) < MISSING_FRAC, col] = np.nan
+
     return df
 
+
+def generate_it_jobs_data(n_samples=2000, seed=42):
+    # Seed for reproducibility
+    rng = np.random.default_rng(seed)
+    return generate_it_jobs_chunk(rng, n_samples)
+
+
+def _output_format(output_path):
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext == '.parquet':
+        return 'parquet'
+    if ext == '.csv':
+        return 'csv'
+    raise ValueError(f"Unsupported output format '{ext}' (expected .csv or .parquet)")
+
+
+def write_it_jobs_data(output_path, n_samples, chunk_size=1_000_000, seed=42, verbose=True):
+    """Stream `n_samples` postings to CSV/Parquet in fixed-size chunks.
+
+    Only one chunk is held in memory at a time, so peak memory depends on
+    `chunk_size` rather than `n_samples`. `seed` may be an int or a
+    `np.random.SeedSequence`.
+    """
+    fmt = _output_format(output_path)
+    rng = np.random.default_rng(seed)
+
+    out_dir = os.path.dirname(output_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    writer = None
+    if fmt == 'parquet':
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Writing .parquet output requires pyarrow (pip install pyarrow)") from e
+        schema = pa.schema([(col, pa.string()) for col in COLUMNS])
+        writer = pq.ParquetWriter(output_path, schema)
+
+    written = 0
+    start = time.perf_counter()
+    try:
+        with (open(output_path, 'w', newline='', encoding='utf-8') if fmt == 'csv' else nullcontext()) as f:
+            while written < n_samples:
+                n_rows = min(chunk_size, n_samples - written)
+                chunk = generate_it_jobs_chunk(rng, n_rows)
+                if fmt == 'csv':
+                    chunk.to_csv(f, header=(written == 0), index=False)
+                else:
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                written += n_rows
+                elapsed = time.perf_counter() - start
+                if verbose:
+                    print(f"  {written:,}/{n_samples:,} rows ({written / max(elapsed, 1e-9):,.0f} rows/s)")
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return written
+
+
+def _write_shard(task):
+    path, n_rows, chunk_size, seed_seq = task
+    return write_it_jobs_data(path, n_rows, chunk_size=chunk_size, seed=seed_seq, verbose=False)
+
+
+def write_it_jobs_shards(output_dir, n_samples, n_shards, n_workers=None,
+                         chunk_size=1_000_000, seed=42, fmt='csv'):
+    """Generate a partitioned dataset (one file per shard) in a process pool.
+
+    Shard `i` gets the `i`-th child of `SeedSequence(seed)` and a fixed row
+    count, so every part file is byte-identical across runs regardless of
+    `n_workers`.
+    """
+    if n_shards < 1:
+        raise ValueError("n_shards must be >= 1")
+    if fmt not in ('csv', 'parquet'):
+        raise ValueError(f"Unsupported output format '{fmt}' (expected csv or parquet)")
+
+    os.makedirs(output_dir, exist_ok=True)
+    # Remove parts left over from a previous run with more shards
+    for old in glob.glob(os.path.join(output_dir, "part-*")):
+        os.remove(old)
+
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    base, extra = divmod(n_samples, n_shards)
+    tasks = [
+        (os.path.join(output_dir, f"part-{i:05d}.{fmt}"), base + (1 if i < extra else 0), chunk_size, seeds[i])
+        for i in range(n_shards)
+    ]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        for (path, _, _, _), n_rows in zip(tasks, pool.map(_write_shard, tasks)):
+            print(f"  wrote {path} ({n_rows:,} rows)")
+    elapsed = time.perf_counter() - start
+    print(f"Generated {n_samples:,} rows in {n_shards} shards "
+          f"({n_samples / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    manifest = {
+        'seed': seed,
+        'n_samples': n_samples,
+        'shards': [{'file': os.path.basename(path), 'rows': n_rows} for path, n_rows, _, _ in tasks]
+    }
+    with open(os.path.join(output_dir, "_manifest.json"), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    return [path for path, _, _, _ in tasks]
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic IT Job Market data.")
+    parser.add_argument("--rows", type=int, default=2000, help="Number of postings to generate")
+    parser.add_argument("--output", default="data/vietnam_it_jobs.csv", help="Output .csv or .parquet file")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Rows generated per chunk")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--shards", type=int, default=None,
+                        help="Write a partitioned dataset with this many part files; --output is then a directory")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --shards (default: all cores)")
+    parser.add_argument("--format", choices=['csv', 'parquet'], default='csv', help="Part file format for --shards")
+    args = parser.parse_args()
+
     print("Generating synthetic IT Job Market data...")
-    df = generate_it_jobs_data(2000)
-    output_path = "data/vietnam_it_jobs.csv"
-    
-    # Ensure directory exists
-    import os
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    df.to_csv(output_path, index=False)
-    print(f"Dataset generated at {output_path}")
-    print(df.head())
-    print(df.info())
+    if args.shards:
+        write_it_jobs_shards(args.output, args.rows, args.shards, n_workers=args.workers,
+                             chunk_size=args.chunk_size, seed=args.seed, fmt=args.format)
+        print(f"Dataset generated at {args.output}/")
+    else:
+        n = write_it_jobs_data(args.output, args.rows, chunk_size=args.chunk_size, seed=args.seed)
+        print(f"Dataset generated at {args.output} ({n:,} rows)")
@@ -0,0 +1,72 @@
+import numpy as np
+import argparse
+import asyncio
+import json
+import random
+import time
+from train_model import EXP_LEVELS
+
+TITLES = ['Backend Developer', 'Frontend Developer', 'Fullstack Developer', 'Data Scientist',
+          'AI/ML Engineer', 'DevOps Engineer', 'Mobile Developer', 'Tester/QA']
+LOCATIONS = ['Ho Chi Minh', 'Ha Noi', 'Da Nang', 'Remote', 'Can Tho']
+
+
+async def _client(host, port, n_requests, latencies, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n_requests):
+            body = json.dumps({
+                'Experience': rng.choice(EXP_LEVELS),
+                'Job Title': rng.choice(TITLES),
+                'Location': rng.choice(LOCATIONS)
+            }).encode()
+            request = (f"POST /predict HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':')[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if b' 200 ' not in status:
+                raise RuntimeError(f"Unexpected response: {status.decode().strip()}")
+    finally:
+        writer.close()
+
+
+async def run_load_test(host="127.0.0.1", port=8000, concurrency=64, requests=5000, seed=42):
+    """Fire `requests` single-row predicts from `concurrency` keep-alive clients."""
+    rng = random.Random(seed)
+    latencies = []
+    per_client = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, n, latencies, random.Random(rng.random()))
+                           for n in per_client if n))
+    elapsed = time.perf_counter() - start
+
+    lat_ms = np.array(latencies) * 1000
+    print(f"Requests: {len(lat_ms):,} | concurrency: {concurrency} | elapsed: {elapsed:.2f}s")
+    print(f"Throughput: {len(lat_ms) / elapsed:,.0f} req/s")
+    print("Latency (ms): " + " | ".join(
+        f"{name} {np.percentile(lat_ms, q):.2f}" for name, q in (('p50', 50), ('p95', 95), ('p99', 99))
+    ) + f" | max {lat_ms.max():.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local load generator for serve_model.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent keep-alive clients")
+    parser.add_argument("--requests", type=int, default=5000, help="Total requests")
+    args = parser.parse_args()
+
+    asyncio.run(run_load_test(args.host, args.port, args.concurrency, args.requests))
@@ -0,0 +1,189 @@
+import pandas as pd
+import joblib
+import argparse
+import asyncio
+import json
+import time
+from train_model import EXP_LEVELS
+
+FEATURES = ['Experience', 'Job Title', 'Location']
+# Larger request bodies are rejected before being read (413)
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class MicroBatcher:
+    """Coalesce concurrent predict calls into one `model.predict` per batch.
+
+    The first queued request opens a window of `max_wait_ms`; everything
+    that arrives before it closes (up to `max_batch` rows) is scored in a
+    single call on a worker thread.
+    """
+
+    def __init__(self, model, max_batch=256, max_wait_ms=5.0):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.rows = 0
+
+    async def predict(self, rows):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            n_rows = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            while n_rows < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                n_rows += len(item[0])
+
+            X = pd.DataFrame([row for rows, _ in pending for row in rows], columns=FEATURES)
+            try:
+                pred = await loop.run_in_executor(None, self.model.predict, X)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.rows += len(X)
+            offset = 0
+            for rows, future in pending:
+                if not future.done():
+                    future.set_result(pred[offset:offset + len(rows)].tolist())
+                offset += len(rows)
+
+
+def parse_instances(payload):
+    """Validate a predict payload: one feature object or {"instances": [...]}."""
+    single = 'instances' not in payload
+    instances = [payload] if single else payload['instances']
+    if not isinstance(instances, list) or not instances:
+        raise ValueError("'instances' must be a non-empty list")
+    rows = []
+    for inst in instances:
+        if not isinstance(inst, dict):
+            raise ValueError("each instance must be a JSON object")
+        missing = [f for f in FEATURES if not isinstance(inst.get(f), str)]
+        if missing:
+            raise ValueError(f"missing or non-string features: {missing}")
+        if inst['Experience'] not in EXP_LEVELS:
+            raise ValueError(f"Experience must be one of {EXP_LEVELS}")
+        rows.append([inst[f] for f in FEATURES])
+    return rows, single
+
+
+def _response(status, body):
+    reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+              500: 'Internal Server Error'}[status]
+    data = json.dumps(body).encode()
+    head = (f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n").encode()
+    return head + data
+
+
+async def handle_request(batcher, method, path, body):
+    if method == 'GET' and path == '/health':
+        return _response(200, {'status': 'ok', 'batches': batcher.batches, 'rows': batcher.rows})
+    if path != '/predict':
+        return _response(404, {'error': 'not found'})
+    if method != 'POST':
+        return _response(400, {'error': 'use POST /predict'})
+    try:
+        rows, single = parse_instances(json.loads(body or b'{}'))
+    except (ValueError, TypeError) as e:
+        return _response(400, {'error': str(e)})
+    try:
+        pred = await batcher.predict(rows)
+    except Exception as e:
+        return _response(500, {'error': str(e)})
+    if single:
+        return _response(200, {'predicted_salary_million': pred[0]})
+    return _response(200, {'predictions': pred})
+
+
+async def handle_connection(batcher, reader, writer):
+    """Minimal HTTP/1.1 with keep-alive: one request after another per connection."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+            except ValueError:
+                writer.write(_response(400, {'error': 'malformed request line'}))
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length = headers.get('content-length', '') or '0'
+            if not (length.isascii() and length.isdigit()):
+                writer.write(_response(400, {'error': 'invalid Content-Length'}))
+                break
+            if int(length) > MAX_BODY_BYTES:
+                writer.write(_response(413, {'error': f'body larger than {MAX_BODY_BYTES:,} bytes'}))
+                break
+            body = await reader.readexactly(int(length))
+
+            writer.write(await handle_request(batcher, method, path.split('?')[0], body))
+            await writer.drain()
+            if headers.get('connection', '').lower() == 'close':
+                break
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(model_path="models/salary_model.pkl", host="127.0.0.1", port=8000,
+                max_batch=256, max_wait_ms=5.0):
+    print(f"Loading model from {model_path}...")
+    start = time.perf_counter()
+    model = joblib.load(model_path)
+    # Warm up so the first request does not pay for lazy initialization
+    model.predict(pd.DataFrame([[EXP_LEVELS[0], 'Backend Developer', 'Ha Noi']], columns=FEATURES))
+    print(f"Model ready in {time.perf_counter() - start:.2f}s")
+
+    batcher = MicroBatcher(model, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    batch_task = asyncio.create_task(batcher.run())
+    server = await asyncio.start_server(lambda r, w: handle_connection(batcher, r, w), host, port)
+    print(f"Serving POST http://{host}:{port}/predict (max_batch={max_batch}, max_wait_ms={max_wait_ms})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batch_task.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Salary prediction HTTP service with micro-batching.")
+    parser.add_argument("--model", default="models/salary_model.pkl", help="Saved pipeline")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=256, help="Max rows per model.predict call")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="How long the first request in a batch waits for others (0 disables batching)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.model, args.host, args.port, args.max_batch, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,259 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import shutil
+import argparse
+import time
+
+SHARED_FORMAT_VERSION = 1
+# Column -> storage: NumPy dtype of the values, 'dict' (integer codes + vocab.json)
+# or 'Int8' (nullable: int8 values + bool mask)
+SHARED_COLUMNS = {
+    'Job_ID': 'int64',
+    'Job Title': 'dict',
+    'Company': 'dict',
+    'Location': 'dict',
+    'Salary': 'dict',
+    'Skills': 'dict',
+    'Experience': 'dict',
+    'Posted Date': 'datetime64[ms]',
+    'Avg_Salary_Million': 'float32',
+    'Exp_Level': 'Int8',
+}
+
+
+def shared_dataset_path(csv_path):
+    """Directory of memory-mappable column arrays that sits next to a cleaned CSV."""
+    return os.path.splitext(csv_path)[0] + "_mmap"
+
+
+def _column_file(dataset_dir, name, suffix=""):
+    return os.path.join(dataset_dir, name.replace(' ', '_') + suffix + ".npy")
+
+
+def _codes_dtype(n_categories):
+    """Integer dtype pandas uses for the codes of `n_categories` (so from_codes does not copy)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _replace_json(path, data, **kwargs):
+    # Swap the whole file in, so readers see either the old or the new version
+    with open(path + ".tmp", 'w') as f:
+        json.dump(data, f, **kwargs)
+    os.replace(path + ".tmp", path)
+
+
+class _ColumnFile:
+    """A 1-D .npy file opened for appending rows after its current header shape."""
+
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, 'r+b')
+        version = np.lib.format.read_magic(self._f)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, _, self.dtype = read_header(self._f)
+        self.version = version
+        self.data_start = self._f.tell()
+        self.n_rows = shape[0]
+        # Overwrite whatever an interrupted run may have left past the header shape
+        self._f.seek(self.data_start + self.n_rows * self.dtype.itemsize)
+
+    @classmethod
+    def create(cls, path, dtype):
+        np.save(path, np.zeros(0, dtype=dtype))
+        return cls(path)
+
+    def append(self, values):
+        self._f.write(np.ascontiguousarray(values, dtype=self.dtype).tobytes())
+
+    def written(self):
+        return (self._f.tell() - self.data_start) // self.dtype.itemsize
+
+    def read_written(self):
+        self._f.flush()
+        return np.fromfile(self.path, dtype=self.dtype, count=self.written(), offset=self.data_start)
+
+    def commit(self):
+        """Point the header at every row written so far (numpy leaves room for the shape to grow)."""
+        n_rows = self.written()
+        self._f.flush()
+        self._f.seek(0)
+        write_header = np.lib.format.write_array_header_1_0 if self.version == (1, 0) \
+            else np.lib.format.write_array_header_2_0
+        write_header(self._f, {'descr': np.lib.format.dtype_to_descr(self.dtype), 'fortran_order': False,
+                               'shape': (n_rows,)})
+        if self._f.tell() != self.data_start:
+            raise ValueError(f"Header of {self.path} cannot grow in place")
+        self._f.seek(self.data_start + n_rows * self.dtype.itemsize)
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+
+class SharedDatasetWriter:
+    """Appends cleaned rows (in Job_ID order) to the memory-mapped column arrays.
+
+    Incremental runs extend the published .npy files in place: row data
+    first, then each file's header shape, then vocab.json and meta.json
+    (swapped in with os.replace). Readers only look at the first
+    meta['n_rows'] rows, so they never see a partial append, and history
+    is never rewritten. With `rebuild=True` the arrays are built in a temp
+    dir that replaces `out_dir` on `close`. String columns are
+    dictionary-encoded in first-seen order; a column whose codes outgrow
+    their integer dtype is rewritten once, widened, and swapped in.
+    """
+
+    def __init__(self, out_dir, rebuild=False):
+        self.out_dir = out_dir
+        self.rebuild = rebuild
+        if rebuild:
+            self.dir = out_dir.rstrip(os.sep) + ".tmp"
+            shutil.rmtree(self.dir, ignore_errors=True)
+            os.makedirs(self.dir)
+            self.n_rows, self.vocab = 0, {name: [] for name, kind in SHARED_COLUMNS.items() if kind == 'dict'}
+        else:
+            self.dir = out_dir
+            meta = _read_json(os.path.join(out_dir, "meta.json"))
+            if meta is None or meta.get('format_version') != SHARED_FORMAT_VERSION:
+                raise ValueError(f"No shared dataset to extend in {out_dir}, run a full rebuild")
+            self.n_rows, self.vocab = meta['n_rows'], _read_json(os.path.join(out_dir, "vocab.json"))
+
+        self.files = {}
+        for name, kind in SHARED_COLUMNS.items():
+            dtype = {'dict': _codes_dtype(0), 'Int8': np.int8}.get(kind, kind)
+            paths = [(name, _column_file(self.dir, name))]
+            if kind == 'Int8':
+                paths.append((name + ".mask", _column_file(self.dir, name, ".mask")))
+            for key, path in paths:
+                column = _ColumnFile.create(path, bool if key.endswith(".mask") else dtype) if rebuild \
+                    else _ColumnFile(path)
+                if column.n_rows != self.n_rows:
+                    raise ValueError(f"{path} has {column.n_rows:,} rows, meta.json says {self.n_rows:,}")
+                self.files[key] = column
+        self.lookups = {name: {value: i for i, value in enumerate(values)} for name, values in self.vocab.items()}
+
+    def _widen(self, name):
+        column = self.files[name]
+        dtype = _codes_dtype(len(self.vocab[name]))
+        if dtype.itemsize <= column.dtype.itemsize:
+            return
+        codes = column.read_written()
+        column.close()
+        tmp_path = column.path + ".tmp.npy"
+        np.save(tmp_path, codes.astype(dtype))
+        os.replace(tmp_path, column.path)
+        self.files[name] = _ColumnFile(column.path)
+
+    def append(self, chunk):
+        """Add typed cleaned rows whose Job_IDs continue the dataset."""
+        expected = self.files['Job_ID'].written()
+        job_ids = chunk['Job_ID'].to_numpy(dtype=np.int64)
+        if len(job_ids) and not np.array_equal(job_ids, np.arange(expected, expected + len(job_ids))):
+            raise ValueError(f"Rows must continue from Job_ID {expected:,}")
+        for name, kind in SHARED_COLUMNS.items():
+            column = chunk[name]
+            if kind == 'dict':
+                if isinstance(column.dtype, pd.CategoricalDtype):
+                    codes, uniques = column.cat.codes.to_numpy(), column.cat.categories
+                else:
+                    codes, uniques = pd.factorize(column)
+                lookup, vocab = self.lookups[name], self.vocab[name]
+                ids = []
+                for value in uniques:
+                    if value not in lookup:
+                        lookup[value] = len(vocab)
+                        vocab.append(value)
+                    ids.append(lookup[value])
+                self._widen(name)
+                self.files[name].append(np.array(ids + [-1], dtype=np.int64)[codes])  # code -1 (missing) stays -1
+            elif kind == 'Int8':
+                self.files[name].append(column.fillna(0).to_numpy(dtype=np.int8))
+                self.files[name + ".mask"].append(column.isna().to_numpy())
+            else:
+                self.files[name].append(column.to_numpy(dtype=kind))
+
+    def close(self):
+        n_rows = self.files['Job_ID'].written()
+        for column in self.files.values():
+            column.commit()
+            column.close()
+        _replace_json(os.path.join(self.dir, "vocab.json"), self.vocab)
+        _replace_json(os.path.join(self.dir, "meta.json"),
+                      {'format_version': SHARED_FORMAT_VERSION, 'n_rows': n_rows, 'columns': SHARED_COLUMNS}, indent=2)
+        if self.rebuild:
+            shutil.rmtree(self.out_dir, ignore_errors=True)
+            os.replace(self.dir, self.out_dir)
+        return self.out_dir
+
+
+def shared_dataset_is_fresh(csv_path):
+    """True when the shared arrays exist and were published after the CSV."""
+    from clean_data import artifact_is_fresh  # clean_data imports this module
+    return artifact_is_fresh(csv_path, os.path.join(shared_dataset_path(csv_path), "meta.json"))
+
+
+def load_shared_dataset(csv_path="data/vietnam_it_jobs_cleaned.csv", columns=None):
+    """Cleaned postings over read-only memory-mapped arrays, or None when missing/stale.
+
+    No column is copied: numeric columns wrap the mapped arrays, string
+    columns are Categoricals over the mapped codes. Every session and
+    process that loads the same directory shares one copy of the pages
+    in the OS page cache. Only the first meta['n_rows'] rows are used, so
+    a concurrent `SharedDatasetWriter` append is invisible until it
+    completes.
+    """
+    if not shared_dataset_is_fresh(csv_path):
+        return None
+    dataset_dir = shared_dataset_path(csv_path)
+    with open(os.path.join(dataset_dir, "meta.json")) as f:
+        meta = json.load(f)
+    if meta.get('format_version') != SHARED_FORMAT_VERSION:
+        return None
+    with open(os.path.join(dataset_dir, "vocab.json")) as f:
+        vocab = json.load(f)
+
+    n_rows = meta['n_rows']
+    data = {}
+    for name in (columns if columns is not None else meta['columns']):
+        kind = meta['columns'][name]
+        values = np.load(_column_file(dataset_dir, name), mmap_mode='r')[:n_rows]
+        if kind == 'dict':
+            values = pd.Categorical.from_codes(values, dtype=pd.CategoricalDtype(vocab[name]), validate=False)
+        elif kind == 'Int8':
+            mask = np.load(_column_file(dataset_dir, name, ".mask"), mmap_mode='r')[:n_rows]
+            values = pd.arrays.IntegerArray(values, mask)
+        data[name] = pd.Series(values, copy=False)
+    return pd.DataFrame(data, copy=False)
+
+
+if __name__ == "__main__":
+    from clean_data import apply_cleaned_dtypes
+
+    parser = argparse.ArgumentParser(description="Publish the cleaned dataset as memory-mapped column arrays.")
+    parser.add_argument("--input", default="data/vietnam_it_jobs_cleaned.csv", help="Cleaned CSV")
+    parser.add_argument("--chunksize", type=int, default=500_000, help="Rows per streamed chunk")
+    args = parser.parse_args()
+
+    # Full rebuild from the cleaned CSV, which is in Job_ID order
+    start = time.perf_counter()
+    writer = SharedDatasetWriter(shared_dataset_path(args.input), rebuild=True)
+    for chunk in pd.read_csv(args.input, chunksize=args.chunksize):
+        writer.append(apply_cleaned_dtypes(chunk))
+    out_dir = writer.close()
+    print(f"Published to {out_dir} in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    df = load_shared_dataset(args.input)
+    print(f"Mapped {len(df):,} rows x {df.shape[1]} columns in {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,167 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import glob
+import shutil
+
+# On-disk dtype of each column of the skill table parts
+SKILL_PART_DTYPES = {'job_id': '<i8', 'skill_id': '<i4'}
+
+
+def skill_table_path(csv_path):
+    """Directory of the normalized job-to-skill table that sits next to a cleaned CSV."""
+    return os.path.splitext(csv_path)[0] + "_skills"
+
+
+def explode_skills(skills, job_ids, vocab=None):
+    """Split comma-joined `skills` into integer (job_id, skill_id) pairs.
+
+    `vocab` is the skill dictionary (skill_id -> name); unseen skills are
+    appended to it in place, so ids stay stable across chunks and runs.
+    Returns `(job_ids, skill_ids, vocab)`.
+    """
+    if vocab is None:
+        vocab = []
+    if isinstance(skills.dtype, pd.CategoricalDtype):
+        skills = skills.astype(object)
+    split = skills.fillna('').str.split(',')
+    row = np.repeat(np.arange(len(split)), split.str.len().to_numpy())
+    tokens = split.explode().str.strip().to_numpy(dtype=object)
+
+    keep = tokens != ''
+    row, tokens = row[keep], tokens[keep]
+
+    skill_ids = pd.Index(vocab, dtype=object).get_indexer(tokens)
+    unseen = skill_ids < 0
+    if unseen.any():
+        new_skills = pd.unique(tokens[unseen])
+        new_ids = pd.Index(new_skills, dtype=object).get_indexer(tokens[unseen])
+        skill_ids[unseen] = new_ids + len(vocab)
+        vocab.extend(new_skills.tolist())
+
+    return np.asarray(job_ids, dtype=np.int64)[row], skill_ids.astype(np.int32), vocab
+
+
+def _skill_parts(table_dir):
+    return sorted(glob.glob(os.path.join(table_dir, "part-*_job_id.bin")))
+
+
+class SkillTableWriter:
+    """Appends the (job_id, skill_id) pairs of one clean run to a new part, chunk by chunk.
+
+    Every run adds `part-NNNNN_job_id.bin` and `part-NNNNN_skill_id.bin`
+    (raw little-endian arrays), so memory is bounded by the chunk and
+    incremental runs never rewrite earlier parts. `close` writes the
+    whole skill dictionary to vocab.json, which marks the table complete.
+    """
+
+    def __init__(self, csv_path, rebuild=False):
+        self.path = skill_table_path(csv_path)
+        if rebuild:
+            shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path, exist_ok=True)
+        part = f"part-{len(_skill_parts(self.path)):05d}"
+        self._files = {name: open(os.path.join(self.path, f"{part}_{name}.bin"), 'wb') for name in SKILL_PART_DTYPES}
+
+    def append(self, job_ids, skill_ids):
+        for name, values in (('job_id', job_ids), ('skill_id', skill_ids)):
+            self._files[name].write(np.ascontiguousarray(values, dtype=SKILL_PART_DTYPES[name]).tobytes())
+
+    def close(self, vocab):
+        for f in self._files.values():
+            f.close()
+        with open(os.path.join(self.path, "vocab.json"), 'w') as f:
+            json.dump(list(vocab), f)
+
+
+def skill_table_is_fresh(csv_path):
+    """True when the skill table is complete and was written after the CSV."""
+    from clean_data import artifact_is_fresh  # clean_data imports this module
+    return artifact_is_fresh(csv_path, os.path.join(skill_table_path(csv_path), "vocab.json"))
+
+
+def load_skill_vocab(csv_path):
+    """Skill dictionary (skill_id -> name) written by clean_data, or None when missing or stale."""
+    if not skill_table_is_fresh(csv_path):
+        return None
+    with open(os.path.join(skill_table_path(csv_path), "vocab.json")) as f:
+        return json.load(f)
+
+
+def load_skill_table(csv_path):
+    """Load `(job_ids, skill_ids, vocab)` written by clean_data.
+
+    Returns None when the table is missing or older than the cleaned CSV.
+    """
+    vocab = load_skill_vocab(csv_path)
+    if vocab is None:
+        return None
+    columns = {}
+    for name, dtype in SKILL_PART_DTYPES.items():
+        parts = [part.replace("_job_id.bin", f"_{name}.bin") for part in _skill_parts(skill_table_path(csv_path))]
+        columns[name] = np.concatenate([np.zeros(0, dtype=dtype)] + [np.fromfile(part, dtype=dtype) for part in parts])
+    return columns['job_id'].astype(np.int64), columns['skill_id'].astype(np.int32), vocab
+
+
+def skill_table_for(df, csv_path="data/vietnam_it_jobs_cleaned.csv"):
+    """Skill table aligned to the rows of `df`: `(rows, skill_ids, vocab)`.
+
+    `rows` are positions into `df`. Uses the table written at clean time
+    when it covers `df`'s `Job_ID`s, otherwise explodes `df['Skills']`.
+    """
+    table = load_skill_table(csv_path) if 'Job_ID' in df.columns else None
+    if table is not None:
+        job_ids, skill_ids, vocab = table
+        rows = pd.Index(df['Job_ID']).get_indexer(job_ids)
+        found = rows >= 0
+        return rows[found], skill_ids[found], vocab
+
+    return explode_skills(df['Skills'], np.arange(len(df)))
+
+
+def count_skills(skill_ids, n_skills, row_mask=None, rows=None):
+    """Postings per skill id, optionally restricted to `row_mask[rows]`."""
+    if row_mask is not None:
+        skill_ids = skill_ids[row_mask[rows]]
+    return np.bincount(skill_ids, minlength=n_skills)
+
+
+def build_inverted_index(rows, skill_ids, n_skills):
+    """Inverted index skill_id -> sorted row positions, in CSR form.
+
+    Returns `(indptr, postings)`: the rows of skill `s` are
+    `postings[indptr[s]:indptr[s + 1]]`.
+    """
+    order = np.lexsort((rows, skill_ids))
+    postings = np.asarray(rows)[order]
+    indptr = np.zeros(n_skills + 1, dtype=np.int64)
+    np.cumsum(np.bincount(skill_ids, minlength=n_skills), out=indptr[1:])
+    return indptr, postings
+
+
+def match_skills(index, selected_ids, n_rows, mode="any"):
+    """Boolean row mask of postings having ANY / ALL of `selected_ids`.
+
+    Each skill's postings are scattered into a bitmap; ANY ORs the bitmaps
+    and ALL ANDs them, so cost depends on the postings touched, not on
+    string scans over every row.
+    """
+    indptr, postings = index
+    if mode not in ("any", "all"):
+        raise ValueError(f"Unknown match mode '{mode}' (expected 'any' or 'all')")
+    mask = np.zeros(n_rows, dtype=bool)
+    if len(selected_ids) == 0:
+        return mask
+    if mode == "any":
+        for s in selected_ids:
+            mask[postings[indptr[s]:indptr[s + 1]]] = True
+        return mask
+
+    first, rest = selected_ids[0], selected_ids[1:]
+    mask[postings[indptr[first]:indptr[first + 1]]] = True
+    for s in rest:
+        hit = np.zeros(n_rows, dtype=bool)
+        hit[postings[indptr[s]:indptr[s + 1]]] = True
+        mask &= hit
+    return mask
@@ -0,0 +1,120 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+
+# Counters kept per sketch; counts are exact while there are fewer distinct skills
+DEFAULT_CAPACITY = 1024
+UNKNOWN_MONTH = "unknown"
+
+
+def skill_sketch_path(csv_path):
+    """Per-month skill sketches that sit next to a cleaned CSV."""
+    return os.path.splitext(csv_path)[0] + "_skill_sketches.json"
+
+
+class SkillSketch:
+    """Mergeable top-K skill counter (the Misra-Gries form of Space-Saving).
+
+    At most `capacity` counters are kept. After N skill mentions every
+    estimate `c(x)` satisfies
+
+        f(x) - error_bound <= c(x) <= f(x),
+        error_bound = (N - sum of counters) / (capacity + 1) <= N / (capacity + 1)
+
+    so every skill with more than N / (capacity + 1) mentions is kept, and
+    the counts are exact (error_bound == 0) while the number of distinct
+    skills fits in `capacity`. Merging two sketches gives the same
+    guarantee for the combined stream (Agarwal et al., "Mergeable
+    Summaries"), so partitions and months can be combined in any order.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, counts=None, total=0):
+        self.capacity = capacity
+        self.counts = dict(counts or {})
+        self.total = total
+
+    def update(self, names, counts):
+        """Add a batch of (skill, count) pairs, e.g. one chunk's exact counts."""
+        for name, count in zip(names, counts):
+            if count:
+                self.counts[name] = self.counts.get(name, 0) + int(count)
+                self.total += int(count)
+        self._prune()
+        return self
+
+    def _prune(self):
+        if len(self.counts) <= self.capacity:
+            return
+        # Subtract the (capacity+1)-th largest count from every counter, drop the non-positive ones
+        cut = int(np.sort(np.fromiter(self.counts.values(), dtype=np.int64, count=len(self.counts)))[::-1][self.capacity])
+        # Plain ints throughout, so the counters stay JSON-serializable
+        self.counts = {name: int(count - cut) for name, count in self.counts.items() if count > cut}
+
+    def merge(self, other):
+        merged = SkillSketch(min(self.capacity, other.capacity), self.counts, int(self.total + other.total))
+        for name, count in other.counts.items():
+            merged.counts[name] = int(merged.counts.get(name, 0) + count)
+        merged._prune()
+        return merged
+
+    @property
+    def error_bound(self):
+        return (self.total - sum(self.counts.values())) / (self.capacity + 1)
+
+    def top(self, k=10):
+        """[(skill, estimated count)] for the k largest counters, ties by name."""
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'total': self.total, 'counts': self.counts}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['capacity'], data['counts'], data['total'])
+
+
+def posting_months(posted_date):
+    """'YYYY-MM' per posting (UNKNOWN_MONTH where the date is missing)."""
+    return pd.to_datetime(posted_date, errors='coerce').dt.strftime('%Y-%m').fillna(UNKNOWN_MONTH).to_numpy()
+
+
+def update_month_sketches(sketches, months, skill_ids, vocab, capacity=DEFAULT_CAPACITY):
+    """Add exploded (month, skill id) mentions to a {month: SkillSketch} dict in place."""
+    months = np.asarray(months, dtype=object)
+    for month in pd.unique(months):
+        counts = np.bincount(skill_ids[months == month], minlength=len(vocab))
+        present = np.flatnonzero(counts)
+        sketch = sketches.setdefault(month, SkillSketch(capacity))
+        sketch.update([vocab[i] for i in present], counts[present])
+    return sketches
+
+
+def merge_sketches(sketches, months=None):
+    """One sketch over the selected months (all by default); None if nothing matches."""
+    merged = None
+    for month, sketch in sorted(sketches.items()):
+        if months is None or month in months:
+            merged = sketch if merged is None else merged.merge(sketch)
+    return merged
+
+
+def save_skill_sketches(csv_path, sketches):
+    path = skill_sketch_path(csv_path)
+    with open(path, 'w') as f:
+        json.dump({month: sketch.to_dict() for month, sketch in sorted(sketches.items())}, f)
+    return path
+
+
+def skill_sketches_are_fresh(csv_path):
+    """True when the sketches exist and were written after the CSV."""
+    from clean_data import artifact_is_fresh  # clean_data imports this module
+    return artifact_is_fresh(csv_path, skill_sketch_path(csv_path))
+
+
+def load_skill_sketches(csv_path):
+    """{month: SkillSketch} written by clean_data, or None when missing or stale."""
+    if not skill_sketches_are_fresh(csv_path):
+        return None
+    with open(skill_sketch_path(csv_path)) as f:
+        return {month: SkillSketch.from_dict(data) for month, data in json.load(f).items()}
@@ -1,72 +1,480 @@
 import pandas as pd
 import numpy as np
 import joblib
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import train_test_split, KFold, ParameterGrid
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
 from sklearn.preprocessing import OneHotEncoder, StandardScaler, OrdinalEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.base import clone
+from concurrent.futures import ProcessPoolExecutor
 import os
+import json
+import time
+import shutil
+import argparse
+import itertools
+from clean_data import load_cleaned_data
+from compact_model import export_compact_model, compact_model_path, load_compact_model
 
-def train_model():
+EXP_LEVELS = ['Fresher', 'Junior', 'Senior', 'Lead', 'Manager']
+FEATURES = ['Experience', 'Job Title', 'Location']
+TARGET = 'Avg_Salary_Million'
+PREDICTION_TABLE_PATH = "models/salary_prediction_table.csv"
+SEARCH_REPORT_PATH = "models/search_report.json"
+# Prediction interval precomputed for every combination (P10 / P50 / P90)
+QUANTILES = [0.1, 0.5, 0.9]
+
+# Hyperparameter grid per model family for `--search`
+SEARCH_SPACE = {
+    'random_forest': {
+        'n_estimators': [100, 200, 400],
+        'max_depth': [None, 10, 20],
+        'min_samples_leaf': [1, 5, 20],
+    },
+    'hist_gradient_boosting': {
+        'max_iter': [100, 300],
+        'learning_rate': [0.05, 0.1],
+        'max_depth': [None, 6],
+        'min_samples_leaf': [20, 100],
+    },
+}
+
+# Default hyperparameters per training backend (`--backend`)
+BACKENDS = {
+    'random_forest': {'n_estimators': 100},
+    'hist_gradient_boosting': {'max_iter': 300, 'learning_rate': 0.1},
+}
+
+# Encoded CV folds of a search worker, set once by `_init_search_worker`
+_SEARCH_FOLDS = None
+
+
+def build_preprocessor(backend='random_forest'):
+    """Ordinal Experience plus Job Title/Location encoded for `backend`.
+
+    The forest gets one-hot columns; gradient boosting gets integer codes
+    and splits on them natively (unknown categories become NaN = missing).
+    """
+    if backend == 'hist_gradient_boosting':
+        cat = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=np.nan)
+    else:
+        cat = OneHotEncoder(handle_unknown='ignore')
+    return ColumnTransformer(
+        transformers=[
+            ('ord', OrdinalEncoder(categories=[EXP_LEVELS]), ['Experience']),
+            ('cat', cat, ['Job Title', 'Location'])
+        ])
+
+
+def make_regressor(backend, params=None):
+    params = dict(BACKENDS[backend] if params is None else params)
+    if backend == 'random_forest':
+        return RandomForestRegressor(random_state=42, **params)
+    if backend == 'hist_gradient_boosting':
+        # Columns after build_preprocessor: Experience (ordered), Job Title, Location
+        return HistGradientBoostingRegressor(categorical_features=[False, True, True], random_state=42, **params)
+    raise ValueError(f"Unknown model backend '{backend}'")
+
+
+def model_backend(model_pipeline):
+    regressor = model_pipeline.named_steps['regressor']
+    if isinstance(regressor, HistGradientBoostingRegressor):
+        return 'hist_gradient_boosting'
+    return 'random_forest'
+
+
+def build_pipeline(regressor):
+    backend = 'hist_gradient_boosting' if isinstance(regressor, HistGradientBoostingRegressor) else 'random_forest'
+    return Pipeline(steps=[
+        ('preprocessor', build_preprocessor(backend)),
+        ('regressor', regressor)
+    ])
+
+
+def model_metadata_path(model_path):
+    """JSON sidecar describing the pickled pipeline (backend, metrics, ...)."""
+    return os.path.splitext(model_path)[0] + ".json"
+
+
+def load_model_metadata(model_path):
+    path = model_metadata_path(model_path)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def single_row_latency_ms(model_pipeline, X, n_runs=50):
+    """Median latency of predicting one row, for comparing backends."""
+    row = X.iloc[[0]]
+    times = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        model_pipeline.predict(row)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1000)
+
+
+def fit_quantile_models(model_pipeline, X, y):
+    """P10/P50/P90 pipelines for gradient boosting (forests use per-tree percentiles instead)."""
+    if model_backend(model_pipeline) != 'hist_gradient_boosting':
+        return None
+    regressor = model_pipeline.named_steps['regressor']
+    models = {}
+    for q in QUANTILES:
+        print(f"Training P{round(q * 100)} quantile model...")
+        quantile_regressor = clone(regressor).set_params(loss='quantile', quantile=q)
+        models[q] = build_pipeline(quantile_regressor).fit(X, y)
+    return models
+
+
+def build_prediction_table(model_pipeline, df, compact=None, quantile_models=None):
+    """Predict every Experience x Job Title x Location combination in one batch.
+
+    Besides the point estimate the table holds a P10/P50/P90 range -
+    percentiles over the individual trees of `compact` (one vectorized
+    pass over all trees) or the `quantile_models` of a boosting backend -
+    and the observed market min/avg/max per combination from `df`.
+    """
+    titles = sorted(df['Job Title'].dropna().unique())
+    locations = sorted(df['Location'].dropna().unique())
+    grid = pd.DataFrame(
+        list(itertools.product(EXP_LEVELS, titles, locations)),
+        columns=FEATURES
+    )
+    grid['Predicted_Salary_Million'] = model_pipeline.predict(grid)
+
+    if compact is not None:
+        quantiles = np.percentile(compact.predict_trees(grid), [q * 100 for q in QUANTILES], axis=0)
+    elif quantile_models:
+        quantiles = [quantile_models[q].predict(grid) for q in QUANTILES]
+    else:
+        quantiles = None
+    if quantiles is not None:
+        # Quantile models are fitted independently, so sort to keep P10 <= P50 <= P90
+        for q, values in zip(QUANTILES, np.sort(np.asarray(quantiles), axis=0)):
+            grid[f'Salary_P{round(q * 100)}'] = values
+
+    market = df.groupby(FEATURES, observed=True)[TARGET].agg(
+        Market_Min='min', Market_Avg='mean', Market_Max='max', Market_Count='size').reset_index()
+    market[FEATURES] = market[FEATURES].astype(str)
+    grid = grid.merge(market, on=FEATURES, how='left')
+    grid['Market_Count'] = grid['Market_Count'].fillna(0).astype(np.int64)
+    return grid
+
+
+def save_model_artifacts(model_pipeline, df, model_path, metrics=None, quantile_models=None, trees_grown=None):
+    """Save the pipeline plus its metadata, compact export and prediction table next to it.
+
+    `df` needs the feature columns and the target (for market statistics),
+    plus `Job_ID` to record which postings the model has seen.
+    `trees_grown` is the number of trees a forest has grown over all its
+    warm starts (default: the trees it holds).
+    """
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    joblib.dump(model_pipeline, model_path)
+    print(f"Model saved to {model_path}")
+
+    import sklearn
+    regressor = model_pipeline.named_steps['regressor']
+    if trees_grown is None and isinstance(regressor, RandomForestRegressor):
+        trees_grown = len(regressor.estimators_)
+    metadata = {
+        'backend': model_backend(model_pipeline),
+        'params': {k: v for k, v in model_pipeline.named_steps['regressor'].get_params().items()
+                   if isinstance(v, (int, float, str, bool, type(None)))},
+        'n_rows': len(df),
+        # Newest posting the model could have seen; later retrains only evaluate on newer ones
+        'max_job_id': int(df['Job_ID'].max()) if 'Job_ID' in df.columns and len(df) else None,
+        # Seeds drawn so far; warm starts continue after them even when old trees were dropped
+        'n_trees_grown': trees_grown,
+        'trained_at': pd.Timestamp.now().isoformat(timespec='seconds'),
+        'sklearn_version': sklearn.__version__,
+        'metrics': metrics or {},
+    }
+    with open(model_metadata_path(model_path), 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+    compact_dir = compact_model_path(model_path)
+    if isinstance(model_pipeline.named_steps['regressor'], RandomForestRegressor):
+        export_compact_model(model_pipeline, compact_dir)
+        print(f"Compact model saved to {compact_dir}")
+    else:
+        # The NumPy engine only understands forests; drop an export of an older model
+        shutil.rmtree(compact_dir, ignore_errors=True)
+
+    table = build_prediction_table(model_pipeline, df, compact=load_compact_model(model_path),
+                                   quantile_models=quantile_models)
+    table_path = os.path.join(os.path.dirname(model_path), os.path.basename(PREDICTION_TABLE_PATH))
+    table.to_csv(table_path, index=False)
+    print(f"Prediction table ({len(table):,} combinations) saved to {table_path}")
+
+
+def train_model(backend='random_forest', since=None, until=None):
     input_path = "data/vietnam_it_jobs_cleaned.csv"
     model_path = "models/salary_model.pkl"
     
-    # Check if data exists
-    if not os.path.exists(input_path):
-        print("Data file not found!")
-        return
-
-    print("Loading data...")
-    df = pd.read_csv(input_path)
-    
     # Feature Engineering
     # We will use Experience (Ordinal), Job Title (Nominal), Location (Nominal)
     # Target: Avg_Salary_Million
     
-    features = ['Experience', 'Job Title', 'Location']
-    target = 'Avg_Salary_Million'
+    features = FEATURES
+    target = TARGET
+
+    # Only the partitions of the [since, until) Posted Date range are read
+    print("Loading data...")
+    df = load_cleaned_data(input_path, columns=features + [target, 'Job_ID'], since=since, until=until)
+    
+    # Check if data exists
+    if df is None:
+        print("Data file not found!")
+        return
     
     X = df[features]
     y = df[target]
     
-    # Define preprocessing
-    # Experience Level needs specific ordering
-    exp_order = [['Fresher', 'Junior', 'Senior', 'Lead', 'Manager']]
-    
-    categorical_features = ['Job Title', 'Location']
-    ordinal_features = ['Experience']
-    
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ('ord', OrdinalEncoder(categories=exp_order), ordinal_features),
-            ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
-        ])
-    
     # Create Pipeline
-    model_pipeline = Pipeline(steps=[
-        ('preprocessor', preprocessor),
-        ('regressor', RandomForestRegressor(n_estimators=100, random_state=42))
-    ])
+    # Experience Level needs specific ordering (OrdinalEncoder); titles/locations are
+    # one-hot for the forest and native categoricals for gradient boosting
+    model_pipeline = build_pipeline(make_regressor(backend))
     
     # Split Data
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
     
-    print("Training Random Forest model...")
+    print(f"Training {backend} model...")
+    start = time.perf_counter()
     model_pipeline.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
     
     # Evaluate
     y_pred = model_pipeline.predict(X_test)
     mae = mean_absolute_error(y_test, y_pred)
     r2 = r2_score(y_test, y_pred)
+    latency = single_row_latency_ms(model_pipeline, X_test)
     
     print(f"Model Performance:\nMAE: {mae:.2f} Million VND\nR2 Score: {r2:.2f}")
+    print(f"Fit: {fit_seconds:.2f}s, single-row predict: {latency:.2f} ms")
     
-    # Save Model
-    os.makedirs(os.path.dirname(model_path), exist_ok=True)
-    joblib.dump(model_pipeline, model_path)
-    print(f"Model saved to {model_path}")
+    # Save Model (+ metadata and prediction lookup table)
+    save_model_artifacts(model_pipeline, df, model_path, metrics={
+        'test_mae': float(mae), 'test_r2': float(r2),
+        'fit_seconds': fit_seconds, 'single_row_ms': latency
+    }, quantile_models=fit_quantile_models(model_pipeline, X_train, y_train))
+
+
+
+def _encode_folds(X, y, n_folds, backends):
+    """Fit each backend's ColumnTransformer once per CV fold and keep the encoded matrices."""
+    folds = []
+    for train_idx, val_idx in KFold(n_splits=n_folds, shuffle=True, random_state=42).split(X):
+        encoded = {}
+        for backend in backends:
+            preprocessor = build_preprocessor(backend)
+            encoded[backend] = (preprocessor.fit_transform(X.iloc[train_idx]).astype(np.float32),
+                                preprocessor.transform(X.iloc[val_idx]).astype(np.float32))
+        folds.append((encoded, y[train_idx], y[val_idx]))
+    return folds
+
+
+def _init_search_worker(folds):
+    global _SEARCH_FOLDS
+    _SEARCH_FOLDS = folds
+
+
+def _score_candidate(family, params):
+    """Mean CV metrics of one candidate, fitted on the pre-encoded folds."""
+    maes, r2s = [], []
+    start = time.perf_counter()
+    for encoded, y_tr, y_val in _SEARCH_FOLDS:
+        X_tr, X_val = encoded[family]
+        model = make_regressor(family, params).fit(X_tr, y_tr)
+        y_pred = model.predict(X_val)
+        maes.append(mean_absolute_error(y_val, y_pred))
+        r2s.append(r2_score(y_val, y_pred))
+    return {
+        'family': family,
+        'params': params,
+        'cv_mae': float(np.mean(maes)),
+        'cv_mae_std': float(np.std(maes)),
+        'cv_r2': float(np.mean(r2s)),
+        'fit_seconds': time.perf_counter() - start,
+    }
+
+
+def search_hyperparameters(input_path="data/vietnam_it_jobs_cleaned.csv", model_path="models/salary_model.pkl",
+                           report_path=SEARCH_REPORT_PATH, n_folds=3, n_workers=None, since=None, until=None):
+    """Grid search over SEARCH_SPACE in a process pool, then refit and save the best model.
+
+    Each fold is encoded once up front and handed to every worker through
+    the pool initializer, so candidates only pay for fitting the regressor.
+    """
+    print("Loading data...")
+    df = load_cleaned_data(input_path, columns=FEATURES + [TARGET, 'Job_ID'], since=since, until=until)
+    if df is None:
+        print("Data file not found!")
+        return
+
+    X = df[FEATURES]
+    y = df[TARGET]
+    # Same hold-out split as train_model, so test metrics are comparable
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    start = time.perf_counter()
+    folds = _encode_folds(X_train, y_train.to_numpy(dtype=np.float64), n_folds, list(SEARCH_SPACE))
+    print(f"Encoded {n_folds} folds in {time.perf_counter() - start:.2f}s")
+
+    candidates = [(family, params) for family, grid in SEARCH_SPACE.items() for params in ParameterGrid(grid)]
+    print(f"Evaluating {len(candidates)} candidates x {n_folds} folds...")
+    results = []
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_search_worker, initargs=(folds,)) as pool:
+        futures = [pool.submit(_score_candidate, family, params) for family, params in candidates]
+        for i, future in enumerate(futures):
+            result = future.result()
+            results.append(result)
+            print(f"  [{i + 1}/{len(candidates)}] {result['family']} {result['params']}: "
+                  f"MAE {result['cv_mae']:.3f}, R2 {result['cv_r2']:.3f}")
+    search_seconds = time.perf_counter() - start
+    results.sort(key=lambda r: r['cv_mae'])
+    best = results[0]
+    print(f"Best: {best['family']} {best['params']} (CV MAE {best['cv_mae']:.3f})")
+
+    # Refit the winner on the whole training split and evaluate on the hold-out set
+    model_pipeline = build_pipeline(make_regressor(best['family'], best['params']))
+    model_pipeline.fit(X_train, y_train)
+    y_pred = model_pipeline.predict(X_test)
+    test = {'mae': float(mean_absolute_error(y_test, y_pred)), 'r2': float(r2_score(y_test, y_pred))}
+    print(f"Model Performance:\nMAE: {test['mae']:.2f} Million VND\nR2 Score: {test['r2']:.2f}")
+
+    save_model_artifacts(model_pipeline, df, model_path,
+                         metrics={'test_mae': test['mae'], 'test_r2': test['r2'], 'cv_mae': best['cv_mae']},
+                         quantile_models=fit_quantile_models(model_pipeline, X_train, y_train))
+
+    report = {
+        'n_rows': len(df),
+        'n_folds': n_folds,
+        'search_seconds': search_seconds,
+        'best': best,
+        'test': test,
+        'candidates': results,
+    }
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Search report saved to {report_path}")
+    return report
+
+
+def retrain_model(input_path="data/vietnam_it_jobs_cleaned.csv", model_path="models/salary_model.pkl",
+                  window_days=30, add_trees=20, max_trees=None, compare=False):
+    """Warm-start the saved forest with trees fitted on recent postings only.
+
+    Postings from the last `window_days` (by `Posted Date`) are encoded
+    with the already-fitted preprocessor and `add_trees` new trees are
+    grown on them; with `max_trees` the oldest trees are dropped so the
+    forest slides along with the data. Titles/locations first seen in the
+    window are ignored by the one-hot encoder until the next full train.
+
+    The holdout is 20% of the window postings newer than the saved
+    model's training data (`max_job_id` in its metadata), split off before
+    the warm start, so neither the old, the warm-started nor the
+    `compare=True` full retrain (fitted on everything else) has seen it.
+    """
+    print(f"Loading model from {model_path}...")
+    model_pipeline = joblib.load(model_path)
+    forest = model_pipeline.named_steps['regressor']
+    if not isinstance(forest, RandomForestRegressor):
+        raise ValueError("Warm-start retraining supports the random forest pipeline only")
+
+    metadata = load_model_metadata(model_path) or {}
+    seen = metadata.get('max_job_id')
+    if seen is None:
+        print("Model metadata does not record its training postings, run a full train first")
+        return
+
+    print("Loading data...")
+    df = load_cleaned_data(input_path, columns=FEATURES + [TARGET, 'Posted Date', 'Job_ID'])
+    if df is None:
+        print("Data file not found!")
+        return
+
+    # Sliding window over Posted Date
+    cutoff = df['Posted Date'].max() - pd.Timedelta(days=window_days)
+    recent = df['Posted Date'] > cutoff
+    window = df[recent]
+    unseen = window[window['Job_ID'] > seen]
+    if len(unseen) < 10:
+        print(f"Only {len(unseen)} postings after {cutoff.date()} that the saved model has not seen, "
+              "nothing to retrain on")
+        return
+    # Hold out unseen postings before the warm start, so the comparison is not biased towards the old trees
+    _, holdout_index = train_test_split(unseen.index, test_size=0.2, random_state=42)
+    X_holdout, y_holdout = df.loc[holdout_index, FEATURES], df.loc[holdout_index, TARGET]
+    train_window = window.drop(index=holdout_index)
+    X_new, y_new = train_window[FEATURES], train_window[TARGET]
+    print(f"Window: {len(window):,} postings after {cutoff.date()}, {len(unseen):,} unseen by the model "
+          f"({len(X_new):,} train / {len(X_holdout):,} holdout)")
+
+    before_mae = mean_absolute_error(y_holdout, model_pipeline.predict(X_holdout))
+
+    # Add trees on the recent data only, reusing the fitted encoder
+    start = time.perf_counter()
+    n_old = len(forest.estimators_)
+    grown = metadata.get('n_trees_grown', n_old)
+    seed = forest.random_state
+    if isinstance(seed, (int, np.integer)) and grown > n_old:
+        # A warm start skips one seed per kept tree; skip the seeds of the dropped trees too,
+        # so the new trees do not repeat the seeds of the newest kept ones
+        random_state = np.random.RandomState(seed)
+        random_state.randint(np.iinfo(np.int32).max, size=grown - n_old)
+        forest.set_params(random_state=random_state)
+    forest.set_params(warm_start=True, n_estimators=n_old + add_trees)
+    forest.fit(model_pipeline.named_steps['preprocessor'].transform(X_new), y_new)
+    forest.set_params(random_state=seed)
+    if max_trees is not None and len(forest.estimators_) > max_trees:
+        forest.estimators_ = forest.estimators_[-max_trees:]
+        forest.n_estimators = max_trees
+    warm_seconds = time.perf_counter() - start
+    warm_mae = mean_absolute_error(y_holdout, model_pipeline.predict(X_holdout))
+    print(f"Warm start: {n_old} + {add_trees} trees (kept {len(forest.estimators_)}) in {warm_seconds:.2f}s, "
+          f"holdout MAE {before_mae:.3f} -> {warm_mae:.3f} Million VND")
+
+    if compare:
+        rest = df.drop(index=holdout_index)
+        full_pipeline = build_pipeline(RandomForestRegressor(n_estimators=len(forest.estimators_), random_state=42))
+        start = time.perf_counter()
+        full_pipeline.fit(rest[FEATURES], rest[TARGET])
+        full_seconds = time.perf_counter() - start
+        full_mae = mean_absolute_error(y_holdout, full_pipeline.predict(X_holdout))
+        print(f"Full retrain: {full_seconds:.2f}s, holdout MAE {full_mae:.3f} Million VND "
+              f"(warm start {full_seconds / max(warm_seconds, 1e-9):.1f}x faster)")
+
+    save_model_artifacts(model_pipeline, df, model_path, metrics={'window_holdout_mae': float(warm_mae)},
+                         trees_grown=grown + add_trees)
+
 
 if __name__ == "__main__":
-    train_model()
+    parser = argparse.ArgumentParser(description="Train the salary prediction model.")
+    parser.add_argument("--backend", choices=list(BACKENDS), default='random_forest',
+                        help="Model family: one-hot random forest or gradient boosting with native categoricals")
+    parser.add_argument("--search", action="store_true",
+                        help="Grid-search random forest and gradient boosting, keep the best")
+    parser.add_argument("--folds", type=int, default=3, help="CV folds for --search")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --search (default: all cores)")
+    parser.add_argument("--retrain", action="store_true",
+                        help="Add trees fitted on recent postings to the saved forest instead of training from scratch")
+    parser.add_argument("--window-days", type=int, default=30, help="Posted Date window for --retrain")
+    parser.add_argument("--add-trees", type=int, default=20, help="Trees added per --retrain")
+    parser.add_argument("--max-trees", type=int, default=None, help="Drop the oldest trees beyond this count")
+    parser.add_argument("--compare", action="store_true", help="Also run a full retrain and compare time/accuracy")
+    parser.add_argument("--since", default=None, help="Train on postings from this Posted Date (e.g. 2024-06)")
+    parser.add_argument("--until", default=None, help="... up to this Posted Date, exclusive (e.g. 2025-01)")
+    args = parser.parse_args()
+
+    if args.search:
+        search_hyperparameters(n_folds=args.folds, n_workers=args.workers, since=args.since, until=args.until)
+    elif args.retrain:
+        retrain_model(window_days=args.window_days, add_trees=args.add_trees,
+                      max_trees=args.max_trees, compare=args.compare)
+    else:
+        train_model(args.backend, since=args.since, until=args.until)
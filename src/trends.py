@@ -0,0 +1,187 @@
+import pandas as pd
+import numpy as np
+import os
+import argparse
+from aggregates import salary_histogram, merge_histograms, merge_keyed, histogram_quantiles
+
+# Dimensions with a daily posting count per value
+TREND_DIMS = {'skill': 'skills', 'title': 'titles', 'location': 'locations'}
+FREQS = {'day': 'D', 'week': 'W', 'month': 'M'}
+
+
+def trends_path(csv_path):
+    """Daily trend arrays that sit next to a cleaned CSV."""
+    return os.path.splitext(csv_path)[0] + "_trends.npz"
+
+
+def _days(posted_date):
+    return pd.to_datetime(posted_date, errors='coerce').to_numpy().astype('datetime64[D]')
+
+
+def chunk_trends(chunk, skill_rows, skill_ids, vocab):
+    """Daily counts of one chunk of cleaned postings.
+
+    Returns a dict with the first day (`start`), the value names of every
+    dimension and arrays indexed [value, day] for skills, titles and
+    locations, plus per-day posting totals and salary histograms
+    ([day, salary bin]; always `N_SALARY_BINS` bins, so memory does not
+    depend on the largest salary). `skill_rows` are positions into
+    `chunk` for the exploded `skill_ids`. Rows without a Posted Date are
+    skipped.
+    """
+    day = _days(chunk['Posted Date'])
+    valid = ~np.isnat(day)
+    if not valid.any():
+        return None
+    start = day[valid].min()
+    offset = (day - start).astype(np.int64)
+    n_days = int(offset[valid].max()) + 1
+    d = offset[valid]
+
+    trends = {'start': start, 'postings': np.bincount(d, minlength=n_days)}
+    for dim, column in (('title', 'Job Title'), ('location', 'Location')):
+        codes, names = pd.factorize(chunk[column].to_numpy(dtype=object)[valid])
+        trends[TREND_DIMS[dim]] = [str(n) for n in names]
+        trends[dim] = np.bincount(codes * n_days + d, minlength=len(names) * n_days).reshape(len(names), n_days)
+
+    keep = valid[skill_rows]
+    trends['skills'] = list(vocab)
+    trends['skill'] = np.bincount(skill_ids[keep].astype(np.int64) * n_days + offset[skill_rows[keep]],
+                                  minlength=len(vocab) * n_days).reshape(len(vocab), n_days)
+    trends['salary'] = salary_histogram(chunk['Avg_Salary_Million'].to_numpy(dtype=np.float64)[valid], d, n_days)
+    return trends
+
+
+def _shift(arr, offset, n_days, day_axis):
+    """Place `arr` at `offset` on a day axis of length `n_days`."""
+    shape = list(arr.shape)
+    shape[day_axis] = n_days
+    out = np.zeros(shape, dtype=np.int64)
+    index = [slice(None)] * arr.ndim
+    index[day_axis] = slice(offset, offset + arr.shape[day_axis])
+    out[tuple(index)] = arr
+    return out
+
+
+def merge_trends(a, b):
+    """Combine two trend dicts (e.g. the stored history and a new chunk)."""
+    if a is None or b is None:
+        return a if b is None else b
+    start = min(a['start'], b['start'])
+    off_a, off_b = [int((x['start'] - start) // np.timedelta64(1, 'D')) for x in (a, b)]
+    n_days = max(off_a + len(a['postings']), off_b + len(b['postings']))
+
+    merged = {
+        'start': start,
+        'postings': _shift(a['postings'], off_a, n_days, 0) + _shift(b['postings'], off_b, n_days, 0),
+    }
+    for dim, names in TREND_DIMS.items():
+        merged[names], merged[dim] = merge_keyed(a[names], _shift(a[dim], off_a, n_days, 1),
+                                                 b[names], _shift(b[dim], off_b, n_days, 1))
+    merged['salary'] = merge_histograms(_shift(a['salary'], off_a, n_days, 0), _shift(b['salary'], off_b, n_days, 0))
+    return merged
+
+
+def save_trends(csv_path, trends):
+    path = trends_path(csv_path)
+    arrays = {key: trends[key] for key in ('postings', 'salary', *TREND_DIMS)}
+    names = {names: np.array(trends[names], dtype=str) for names in TREND_DIMS.values()}
+    with open(path, 'wb') as f:
+        np.savez(f, start=np.array(str(trends['start'])), **arrays, **names)
+    return path
+
+
+def trends_are_fresh(csv_path):
+    """True when the trend arrays exist and were written after the CSV."""
+    from clean_data import artifact_is_fresh  # clean_data imports this module
+    return artifact_is_fresh(csv_path, trends_path(csv_path))
+
+
+def load_trends(csv_path):
+    """Trend dict written by clean_data, or None when missing or stale."""
+    if not trends_are_fresh(csv_path):
+        return None
+    with np.load(trends_path(csv_path)) as data:
+        trends = {'start': np.datetime64(str(data['start']), 'D')}
+        for key in ('postings', 'salary', *TREND_DIMS):
+            trends[key] = data[key]
+        for names in TREND_DIMS.values():
+            trends[names] = data[names].tolist()
+    return trends
+
+
+def dates(trends):
+    return pd.date_range(pd.Timestamp(trends['start']), periods=len(trends['postings']), freq='D')
+
+
+def bucket_counts(trends, dim, freq='week'):
+    """Postings per value of `dim` per day/week/month, as a (period x value) DataFrame."""
+    counts = trends[dim]
+    periods = dates(trends).to_period(FREQS[freq])
+    first = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    summed = np.add.reduceat(counts, first, axis=1) if counts.shape[1] else counts
+    return pd.DataFrame(summed.T, index=periods[first].to_timestamp(), columns=trends[TREND_DIMS[dim]])
+
+
+def rolling_counts(trends, dim, window_days=30):
+    """Trailing `window_days` totals per value and day, shape (values, days)."""
+    cum = np.cumsum(trends[dim], axis=1)
+    out = cum.copy()
+    out[:, window_days:] -= cum[:, :-window_days]
+    return out
+
+
+def rolling_salary_median(trends, window_days=30):
+    """Median salary over the trailing `window_days` for every day, as a Series."""
+    cum = np.cumsum(trends['salary'], axis=0)
+    window = cum.copy()
+    window[window_days:] -= cum[:-window_days]
+    medians = [histogram_quantiles(row, 0.5) for row in window]
+    return pd.Series(np.asarray(medians, dtype=np.float64), index=dates(trends), name='Median_Salary_Million')
+
+
+def latest_salary_median(trends, window_days=30):
+    """Median salary over the last `window_days` only (one histogram sum, no per-day loop)."""
+    return float(histogram_quantiles(trends['salary'][-window_days:].sum(axis=0), 0.5))
+
+
+def trending(trends, dim='skill', window_days=30, top=10, min_count=5):
+    """Values of `dim` growing fastest: last `window_days` vs the window before.
+
+    Windows end at the latest posting day. Growth is
+    (current - previous) / previous; values new in the current window
+    have infinite growth and sort first. Only values with at least
+    `min_count` postings in the current window are ranked.
+    """
+    rolling = rolling_counts(trends, dim, window_days)
+    last = rolling.shape[1] - 1
+    current = rolling[:, last]
+    previous = rolling[:, last - window_days] if last >= window_days else np.zeros_like(current)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = np.where(previous > 0, (current - previous) / np.maximum(previous, 1), np.inf)
+    result = pd.DataFrame({
+        'Name': trends[TREND_DIMS[dim]],
+        'Current': current,
+        'Previous': previous,
+        'Growth': growth,
+    })
+    result = result[result['Current'] >= min_count]
+    return result.sort_values(['Growth', 'Current'], ascending=False, ignore_index=True).head(top)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print trending skills/titles/locations from the precomputed series.")
+    parser.add_argument("--input", default="data/vietnam_it_jobs_cleaned.csv", help="Cleaned CSV")
+    parser.add_argument("--dim", choices=list(TREND_DIMS), default="skill")
+    parser.add_argument("--window-days", type=int, default=30)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    trends = load_trends(args.input)
+    if trends is None:
+        print("Trend arrays are missing or stale, run src/clean_data.py first.")
+    else:
+        print(f"{dates(trends)[0].date()} .. {dates(trends)[-1].date()}, {int(trends['postings'].sum()):,} postings")
+        print(trending(trends, args.dim, window_days=args.window_days, top=args.top).to_string(index=False))
+        median = latest_salary_median(trends, args.window_days)
+        print(f"Median salary over the last {args.window_days} days: {median:.1f} Million VND")
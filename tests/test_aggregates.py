@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from aggregates import build_cube, query_cube
+from clean_data import apply_cleaned_dtypes, clean_chunk
+from generate_data import generate_it_jobs_data
+from skill_index import explode_skills
+
+FILTERS = [
+    {},
+    {'location': 'Da Nang'},
+    {'salary_range': (20, 45)},
+    {'location': 'Ha Noi', 'experience': 'Senior', 'salary_range': (30, 60)},
+    {'location': 'Nowhere'},
+]
+
+
+@pytest.fixture(scope="module")
+def postings():
+    df = clean_chunk(generate_it_jobs_data(3000, seed=5)).reset_index(drop=True)
+    df = apply_cleaned_dtypes(df)
+    rows, skill_ids, vocab = explode_skills(df['Skills'], np.arange(len(df)))
+    return df, rows, skill_ids, vocab
+
+
+def _expected(df, rows, skill_ids, vocab, keep):
+    """Summary fields computed row by row with pandas, for rows where `keep` is True."""
+    sub = df[keep]
+    skill_counts = np.bincount(skill_ids[keep[rows]], minlength=len(vocab))
+    by_location = sub['Avg_Salary_Million'].astype(np.float64).groupby(sub['Location'].astype(str)).mean()
+    return len(sub), sub['Avg_Salary_Million'].astype(np.float64).mean(), skill_counts, by_location
+
+
+def _keep(df, location=None, experience=None, salary_range=None):
+    keep = np.ones(len(df), dtype=bool)
+    if location is not None:
+        keep &= (df['Location'] == location).to_numpy()
+    if experience is not None:
+        keep &= (df['Experience'] == experience).to_numpy()
+    if salary_range is not None:
+        salary = df['Avg_Salary_Million'].to_numpy()
+        keep &= (salary >= salary_range[0]) & (salary <= salary_range[1])
+    return keep
+
+
+def _assert_summary(summary, expected):
+    total, avg, skill_counts, by_location = expected
+    assert summary['total_jobs'] == total
+    assert summary['salary_hist']['Count'].sum() == total
+    if total:
+        assert summary['avg_salary'] == pytest.approx(avg)
+        got = summary['salary_by_location']
+        assert dict(zip(got['Location'], got['Avg_Salary_Million'])) == pytest.approx(by_location.to_dict())
+    if skill_counts is not None:
+        np.testing.assert_array_equal(summary['skill_counts'], skill_counts)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_cube_query_matches_pandas(postings, filters):
+    df, rows, skill_ids, vocab = postings
+    cube = build_cube(df, rows, skill_ids, len(vocab))
+    _assert_summary(query_cube(cube, **filters), _expected(df, rows, skill_ids, vocab, _keep(df, **filters)))
+
+
+@pytest.mark.parametrize("filters", FILTERS[:4])
+def test_single_skill_from_skill_cells(postings, filters):
+    df, rows, skill_ids, vocab = postings
+    skill = vocab.index('python')
+    keep = _keep(df, **filters)
+    keep[np.setdiff1d(np.arange(len(df)), rows[skill_ids == skill])] = False
+    summary = query_cube(build_cube(df, rows, skill_ids, len(vocab)), skill=skill, **filters)
+    total, avg, _, by_location = _expected(df, rows, skill_ids, vocab, keep)
+    _assert_summary(summary, (total, avg, None, by_location))
+
+
+def test_cube_over_row_subset(postings):
+    df, rows, skill_ids, vocab = postings
+    keep = _keep(df, salary_range=(10, 40))
+    keep[::3] = False
+    summary = query_cube(build_cube(df, rows, skill_ids, len(vocab), rows=np.flatnonzero(keep)))
+    _assert_summary(summary, _expected(df, rows, skill_ids, vocab, keep))
+
+
+def test_box_stats_match_percentiles(postings):
+    df = postings[0]
+    cube = build_cube(df, *postings[1:3], len(postings[3]))
+    for level, stats in query_cube(cube)['salary_by_experience'].items():
+        salary = df.loc[(df['Experience'] == level).to_numpy(), 'Avg_Salary_Million'].to_numpy(np.float64)
+        np.testing.assert_allclose([stats['q1'], stats['med'], stats['q3']], np.percentile(salary, [25, 50, 75]))
+
@@ -0,0 +1,58 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch_predict import PREDICTION_COLUMN, predict_chunk, predict_file
+from train_model import build_pipeline, make_regressor
+
+FEED = """Experience,Job Title,Location,Note
+Senior,Data Scientist,Ha Noi,
+Junior,Backend Developer,Ho Chi Minh,
+Senior,Unknown,Ha Noi,
+Guru,Data Scientist,Ha Noi,
+,Tester/QA,Da Nang,
+Lead,DevOps Engineer,Da Nang,x
+Fresher,Tester/QA,Ha Noi,1.5
+"""
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    train = pd.DataFrame({
+        'Experience': ['Fresher', 'Junior', 'Senior', 'Lead', 'Manager'] * 4,
+        'Job Title': ['Data Scientist', 'Backend Developer', 'Tester/QA', 'DevOps Engineer'] * 5,
+        'Location': ['Ha Noi', 'Ho Chi Minh', 'Da Nang', 'Ha Noi'] * 5,
+    })
+    model = build_pipeline(make_regressor('random_forest', {'n_estimators': 5}))
+    model.fit(train, np.arange(len(train), dtype=np.float64))
+    path = tmp_path_factory.mktemp("model") / "model.pkl"
+    joblib.dump(model, path)
+    return str(path)
+
+
+def test_unknown_or_missing_features_give_nan(model_path, tmp_path):
+    (tmp_path / "feed.csv").write_text(FEED)
+    pred = predict_chunk(joblib.load(model_path), pd.read_csv(tmp_path / "feed.csv"))
+    assert np.isnan(pred).tolist() == [False, False, True, True, True, False, False]
+
+
+@pytest.mark.parametrize("output", ["out.csv", "out.parquet"])
+def test_chunks_with_different_inferred_types(model_path, tmp_path, output):
+    # 'Note' is empty in the first chunks and text/numbers later
+    (tmp_path / "feed.csv").write_text(FEED)
+    assert predict_file(str(tmp_path / "feed.csv"), str(tmp_path / output), model_path=model_path, chunk_size=2) == 7
+    out = pd.read_csv(tmp_path / output, dtype={'Note': str}) if output.endswith(".csv") \
+        else pd.read_parquet(tmp_path / output)
+    assert out['Note'].tolist()[-2:] == ['x', '1.5']
+    assert out[PREDICTION_COLUMN].isna().sum() == 3
+
+
+def test_parquet_input_keeps_its_schema(model_path, tmp_path):
+    feed = pd.read_csv(pd.io.common.StringIO(FEED))
+    feed['Posted Date'] = pd.Timestamp('2024-01-01')
+    feed.to_parquet(tmp_path / "feed.parquet")
+    predict_file(str(tmp_path / "feed.parquet"), str(tmp_path / "out.parquet"), model_path=model_path, chunk_size=3)
+    out = pd.read_parquet(tmp_path / "out.parquet")
+    assert list(out.columns) == list(feed.columns) + [PREDICTION_COLUMN]
+    assert out['Posted Date'].dtype == feed['Posted Date'].dtype
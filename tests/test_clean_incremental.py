@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from clean_data import artifact_is_fresh, clean_data
+from shared_dataset import load_shared_dataset
+from skill_index import load_skill_table
+
+HEADER = "Job Title,Company,Location,Salary,Skills,Experience,Posted Date\n"
+ROWS = [
+    'Backend Developer,Tech Company 1,Ha Noi,25-59 millions,"Python, Django",Senior,2024-01-05\n',
+    'Mobile Developer,Tech Company 2,Ho Chi Minh,15-29 millions,React Native,Junior,2024-01-20\n',
+    'Data Scientist,Tech Company 3,,30-40 millions,"SQL, Python",Senior,2024-02-01\n',
+    'Tester/QA,Tech Company 4,Da Nang,,"Selenium, Python",Fresher,2024-02-11\n',
+    'DevOps Engineer,Tech Company 5,Ha Noi,Up to 2000 USD,"AWS, Docker, K8s",Lead,2024-03-03\n',
+    'Frontend Developer,Tech Company 1,Remote,20-30 millions,"VueJS, Nuxt",Junior,2024-03-15\n',
+    'AI/ML Engineer,Tech Company 6,Ho Chi Minh,60-90 millions,"Python, NLP, HuggingFace",Manager,2024-04-02\n',
+]
+
+
+def _clean(raw, out, **kwargs):
+    return clean_data(str(raw), str(out), chunksize=2, partition_by=('month',), **kwargs)
+
+
+def _assert_same_outputs(a, b):
+    assert a.read_bytes() == b.read_bytes()
+    for x, y in zip(load_skill_table(str(a)), load_skill_table(str(b))):
+        np.testing.assert_array_equal(x, y)
+    pd.testing.assert_frame_equal(load_shared_dataset(str(a)).astype(object), load_shared_dataset(str(b)).astype(object))
+
+
+def test_incremental_runs_equal_a_full_rebuild(tmp_path):
+    raw, full_raw = tmp_path / "raw.csv", tmp_path / "full_raw.csv"
+    raw.write_text(HEADER + "".join(ROWS[:3]))
+    _clean(raw, tmp_path / "inc.csv", incremental=True)
+    with open(raw, 'a') as f:
+        f.write("".join(ROWS[3:]))
+    assert _clean(raw, tmp_path / "inc.csv", incremental=True) == 3
+    assert _clean(raw, tmp_path / "inc.csv", incremental=True) == 0
+
+    full_raw.write_text(HEADER + "".join(ROWS))
+    assert _clean(full_raw, tmp_path / "full.csv") == 5
+    _assert_same_outputs(tmp_path / "inc.csv", tmp_path / "full.csv")
+
+
+def test_incremental_waits_for_an_unterminated_last_line(tmp_path):
+    raw = tmp_path / "raw.csv"
+    raw.write_text(HEADER + "".join(ROWS[:2]) + ROWS[2][:20])
+    assert _clean(raw, tmp_path / "inc.csv", incremental=True) == 2
+    with open(raw, 'a') as f:
+        f.write(ROWS[2][20:] + ROWS[3])
+    _clean(raw, tmp_path / "inc.csv", incremental=True)
+    (tmp_path / "full_raw.csv").write_text(HEADER + "".join(ROWS[:4]))
+    _clean(tmp_path / "full_raw.csv", tmp_path / "full.csv")
+    _assert_same_outputs(tmp_path / "inc.csv", tmp_path / "full.csv")
+
+
+def test_full_clean_keeps_a_last_line_without_newline(tmp_path):
+    raw = tmp_path / "raw.csv"
+    raw.write_text(HEADER + "".join(ROWS[:2]).rstrip("\n"))
+    assert _clean(raw, tmp_path / "out.csv") == 2
+
+
+def test_artifact_freshness_follows_the_newest_file(tmp_path):
+    csv_path, old, new = (str(tmp_path / name) for name in ("cleaned.csv", "old.bin", "new.bin"))
+    for path, mtime in ((old, 100), (csv_path, 200), (new, 300)):
+        open(path, 'w').close()
+        os.utime(path, (mtime, mtime))
+    assert artifact_is_fresh(csv_path, new)
+    assert artifact_is_fresh(csv_path, old, new)
+    assert not artifact_is_fresh(csv_path, old)
+    assert not artifact_is_fresh(csv_path, new, str(tmp_path / "missing.bin"))
+    assert not artifact_is_fresh(csv_path)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from compact_model import CompactForest, export_compact_model
+from generate_data import generate_it_jobs_data
+from clean_data import clean_chunk
+from train_model import FEATURES, TARGET, build_pipeline, make_regressor
+
+
+@pytest.fixture(scope="module")
+def fitted(tmp_path_factory):
+    df = clean_chunk(generate_it_jobs_data(1500, seed=11)).reset_index(drop=True)
+    model = build_pipeline(make_regressor('random_forest', {'n_estimators': 12, 'max_depth': 8}))
+    model.fit(df[FEATURES], df[TARGET])
+    out_dir = tmp_path_factory.mktemp("compact")
+    export_compact_model(model, str(out_dir))
+    return model, df, str(out_dir)
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_predictions_match_sklearn(fitted, mmap):
+    model, df, out_dir = fitted
+    compact = CompactForest.load(out_dir, mmap=mmap)
+    np.testing.assert_allclose(compact.predict(df[FEATURES]), model.predict(df[FEATURES]), rtol=1e-12)
+
+
+def test_per_tree_predictions_and_threads(fitted):
+    model, df, out_dir = fitted
+    compact = CompactForest.load(out_dir)
+    X = df[FEATURES].head(200)
+    encoded = model.named_steps['preprocessor'].transform(X)
+    encoded = encoded.toarray() if hasattr(encoded, 'toarray') else encoded
+    expected = np.array([tree.predict(encoded) for tree in model.named_steps['regressor'].estimators_])
+    np.testing.assert_allclose(compact.predict_trees(X, n_threads=3), expected, rtol=1e-12)
+
+
+def test_unknown_title_matches_one_hot_ignore(fitted):
+    model, _, out_dir = fitted
+    X = pd.DataFrame([['Senior', 'Astronaut', 'Ha Noi'], ['Junior', 'Data Scientist', 'Mars']], columns=FEATURES)
+    np.testing.assert_allclose(CompactForest.load(out_dir).predict(X), model.predict(X), rtol=1e-12)
+
+
+def test_unknown_experience_raises(fitted):
+    X = pd.DataFrame([['Guru', 'Data Scientist', 'Ha Noi']], columns=FEATURES)
+    with pytest.raises(ValueError):
+        CompactForest.load(fitted[2]).predict(X)
@@ -0,0 +1,22 @@
+import pandas as pd
+
+from generate_data import (COLUMNS, EXPERIENCES, LOCATIONS, MISSING_FRAC, TITLES_SKILLS,
+                           generate_it_jobs_data, write_it_jobs_data)
+
+
+def test_same_seed_same_rows():
+    pd.testing.assert_frame_equal(generate_it_jobs_data(500, seed=7), generate_it_jobs_data(500, seed=7))
+
+
+def test_streamed_csv_has_every_row(tmp_path):
+    path = tmp_path / "jobs.csv"
+    assert write_it_jobs_data(str(path), 1000, chunk_size=300, seed=1, verbose=False) == 1000
+
+    df = pd.read_csv(path)
+    assert list(df.columns) == COLUMNS
+    assert len(df) == 1000
+    assert set(df['Job Title']) <= set(TITLES_SKILLS)
+    assert set(df['Location'].dropna()) <= set(LOCATIONS)
+    assert set(df['Experience']) <= set(EXPERIENCES)
+    # Salary and Location are blanked on about MISSING_FRAC of the rows
+    assert 0 < df['Salary'].isna().mean() < 3 * MISSING_FRAC
@@ -0,0 +1,29 @@
+import os
+
+from generate_data import write_it_jobs_shards
+
+
+def _read_parts(paths):
+    contents = {}
+    for path in paths:
+        with open(path, 'rb') as f:
+            contents[os.path.basename(path)] = f.read()
+    return contents
+
+
+def test_shards_do_not_depend_on_worker_count(tmp_path):
+    one = write_it_jobs_shards(str(tmp_path / "one"), 1001, n_shards=4, n_workers=1, chunk_size=100, seed=3)
+    many = write_it_jobs_shards(str(tmp_path / "many"), 1001, n_shards=4, n_workers=3, chunk_size=100, seed=3)
+    assert _read_parts(one) == _read_parts(many)
+
+
+def test_shard_rows_add_up(tmp_path):
+    paths = write_it_jobs_shards(str(tmp_path), 1001, n_shards=4, n_workers=2, chunk_size=100, seed=3)
+    rows = [sum(1 for _ in open(path)) - 1 for path in paths]
+    assert rows == [251, 250, 250, 250]
+
+
+def test_rerun_removes_extra_shards(tmp_path):
+    write_it_jobs_shards(str(tmp_path), 100, n_shards=4, n_workers=1)
+    write_it_jobs_shards(str(tmp_path), 100, n_shards=2, n_workers=1)
+    assert sorted(p for p in os.listdir(tmp_path) if p.startswith("part-")) == ["part-00000.csv", "part-00001.csv"]
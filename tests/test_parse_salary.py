@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from clean_data import extract_avg_salary, parse_avg_salary
+
+ALPHABET = list("0123456789") * 3 + list(" -–,.$~+") + ["millions", "USD", "Up to ", "\x00", "\n", "é", "٣", "３", "🙂"]
+
+
+def _assert_same_as_regex(values):
+    salary = pd.Series(values, dtype=object)
+    expected = salary.apply(extract_avg_salary).to_numpy(dtype=np.float64)
+    np.testing.assert_array_equal(parse_avg_salary(salary).to_numpy(), expected)
+
+
+def test_generator_formats():
+    _assert_same_as_regex(["15-29 millions", "Up to 2000 USD", "Negotiable", None, "", "7 - 8", "0-0", "1000000"])
+
+
+def test_fuzzed_corpus_matches_regex_parser():
+    rng = np.random.default_rng(0)
+    values = ["".join(rng.choice(ALPHABET, size=rng.integers(0, 12))) for _ in range(5000)]
+    values += ["9" * n + "-1" for n in range(1, 40)]  # digit runs past float64's exact range
+    values[::97] = [None] * len(values[::97])
+    _assert_same_as_regex(values)
+
+
+def test_nul_inside_a_value_does_not_shift_rows():
+    _assert_same_as_regex(["10\x0020", "\x00", "30", "a\x00\x00b 5", "40-60"])
+
+
+def test_non_string_column():
+    salary = pd.Series([15.0, np.nan, 7.5])
+    np.testing.assert_array_equal(parse_avg_salary(salary).to_numpy(), salary.apply(extract_avg_salary).to_numpy())
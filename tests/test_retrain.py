@@ -0,0 +1,50 @@
+import joblib
+
+from clean_data import clean_data, load_cleaned_data
+from generate_data import write_it_jobs_data
+from train_model import (FEATURES, TARGET, build_pipeline, load_model_metadata, make_regressor, retrain_model,
+                         save_model_artifacts)
+
+
+def _append_raw(raw, lines):
+    with open(raw, 'a') as f:
+        f.writelines(lines)
+
+
+def test_warm_starts_after_dropping_trees_use_fresh_seeds(tmp_path):
+    source, raw = tmp_path / "source.csv", tmp_path / "raw.csv"
+    cleaned, model_path = str(tmp_path / "cleaned.csv"), str(tmp_path / "models" / "model.pkl")
+    write_it_jobs_data(str(source), 900, seed=4, verbose=False)
+    lines = source.read_text().splitlines(keepends=True)
+    raw.write_text("".join(lines[:301]))
+    clean_data(str(raw), cleaned, incremental=True)
+
+    df = load_cleaned_data(cleaned, columns=FEATURES + [TARGET, 'Job_ID'])
+    model = build_pipeline(make_regressor('random_forest', {'n_estimators': 10})).fit(df[FEATURES], df[TARGET])
+    save_model_artifacts(model, df, model_path)
+    assert load_model_metadata(model_path)['n_trees_grown'] == 10
+
+    for part in (lines[301:601], lines[601:]):
+        _append_raw(raw, part)
+        clean_data(str(raw), cleaned, incremental=True)
+        retrain_model(cleaned, model_path, window_days=10_000, add_trees=4, max_trees=12)
+
+    forest = joblib.load(model_path).named_steps['regressor']
+    seeds = [tree.random_state for tree in forest.estimators_]
+    assert len(seeds) == 12
+    assert len(set(seeds)) == 12
+    assert forest.random_state == 42
+    metadata = load_model_metadata(model_path)
+    assert metadata['n_trees_grown'] == 18
+    assert metadata['max_job_id'] == len(load_cleaned_data(cleaned, columns=['Job_ID'])) - 1
+
+
+def test_retrain_needs_unseen_postings(tmp_path, capsys):
+    raw, cleaned, model_path = tmp_path / "raw.csv", str(tmp_path / "cleaned.csv"), str(tmp_path / "m" / "model.pkl")
+    write_it_jobs_data(str(raw), 300, seed=4, verbose=False)
+    clean_data(str(raw), cleaned)
+    df = load_cleaned_data(cleaned, columns=FEATURES + [TARGET, 'Job_ID'])
+    save_model_artifacts(build_pipeline(make_regressor('random_forest', {'n_estimators': 5})).fit(df[FEATURES], df[TARGET]),
+                         df, model_path)
+    retrain_model(cleaned, model_path, window_days=10_000)
+    assert "nothing to retrain on" in capsys.readouterr().out
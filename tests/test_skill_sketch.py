@@ -0,0 +1,59 @@
+import numpy as np
+
+from skill_sketch import SkillSketch, load_skill_sketches, merge_sketches, save_skill_sketches
+
+
+def _stream(seed, n_skills=60, n_mentions=3000):
+    """Zipf-like skill mentions: a few frequent skills and a long tail."""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, n_skills + 1)
+    names = [f"skill{i}" for i in rng.choice(n_skills, size=n_mentions, p=weights / weights.sum())]
+    return dict(zip(*np.unique(names, return_counts=True)))
+
+
+def _assert_within_bound(sketch, exact):
+    total = sum(exact.values())
+    assert sketch.total == total
+    assert 0 <= sketch.error_bound <= total / (sketch.capacity + 1)
+    for name, count in exact.items():
+        estimate = sketch.counts.get(name, 0)
+        assert count - sketch.error_bound <= estimate <= count
+        if count > total / (sketch.capacity + 1):
+            assert name in sketch.counts
+
+
+def test_exact_while_skills_fit():
+    exact = _stream(0, n_skills=8)
+    sketch = SkillSketch(capacity=8).update(list(exact), list(exact.values()))
+    assert sketch.counts == exact
+    assert sketch.error_bound == 0
+
+
+def test_pruned_sketch_round_trips_through_json(tmp_path):
+    exact = _stream(1)
+    sketch = SkillSketch(capacity=10)
+    names = list(exact)
+    for i in range(0, len(names), 7):  # several batches, each followed by a prune
+        sketch.update(names[i:i + 7], [exact[n] for n in names[i:i + 7]])
+    assert len(sketch.counts) <= 10
+    _assert_within_bound(sketch, exact)
+
+    csv_path = str(tmp_path / "cleaned.csv")
+    open(csv_path, 'w').close()
+    save_skill_sketches(csv_path, {'2024-01': sketch})
+    loaded = load_skill_sketches(csv_path)['2024-01']
+    assert loaded.to_dict() == sketch.to_dict()
+    assert all(type(count) is int for count in loaded.counts.values())
+
+
+def test_merged_sketches_keep_the_bound():
+    months = {f"2024-0{i}": _stream(i) for i in range(1, 5)}
+    sketches = {month: SkillSketch(capacity=12).update(list(c), list(c.values())) for month, c in months.items()}
+    exact = {}
+    for counts in months.values():
+        for name, count in counts.items():
+            exact[name] = exact.get(name, 0) + int(count)
+    merged = merge_sketches(sketches)
+    _assert_within_bound(merged, exact)
+    assert merge_sketches(sketches, {'2024-02'}).to_dict() == sketches['2024-02'].to_dict()
+    assert merge_sketches(sketches, {'2030-01'}) is None